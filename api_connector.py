@@ -1,4 +1,7 @@
-import requests
+import asyncio
+import hashlib
+import aiohttp
+import orjson
 from error_logger import ErrorLogger
 from cache_manager import CacheManager
 
@@ -6,51 +9,91 @@ class APIConnector:
     """
     Manages API calls, with caching and error logging capabilities.
     """
-    
-    def __init__(self, cache_expiration: int = 300):
-        self.session = requests.Session()
+
+    MAX_RETRIES = 3
+    BACKOFF_FACTOR = 0.3  # Retry delays of 0.3s, 0.6s, 1.2s
+    RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+    def __init__(self, cache_expiration: int = 300, redis_url: str = None):
+        self.session = None  # aiohttp.ClientSession, created lazily inside the running event loop
+        self.headers = {}
         self.error_logger = ErrorLogger()
-        self.cache = CacheManager(expiration_seconds=cache_expiration)  # Cache responses for 5 minutes by default
+        # Cache responses for 5 minutes by default, optionally shared across processes through Redis
+        self.cache = CacheManager(expiration_seconds=cache_expiration, redis_url=redis_url, namespace="api")
 
-    def call_api(self, url: str, method: str = 'GET', headers: dict = None, params: dict = None, data: dict = None) -> dict:
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the shared client session, creating it on first use.
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=64, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=30)
+            timeout = aiohttp.ClientTimeout(sock_connect=3.05, sock_read=27)  # Never block forever on a hung server
+            self.session = aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout)
+        return self.session
+
+    async def call_api(self, url: str, method: str = 'GET', headers: dict = None, params: dict = None, data: dict = None) -> dict:
         """
         Makes an API call and caches the response based on the request parameters.
         """
         headers = headers or {}
         cache_key = self.generate_cache_key(url, method, params, data)
-        
+
         # Check for cached response
-        cached_response = self.cache.get(cache_key)
+        cached_response = await self.cache.aget(cache_key)
         if cached_response:
             return cached_response
 
         try:
             # Perform the API call
-            if method.upper() == 'GET':
-                response = self.session.get(url, headers=headers, params=params)
-            elif method.upper() == 'POST':
-                response = self.session.post(url, headers=headers, json=data)
-            else:
+            method = method.upper()
+            if method not in ('GET', 'POST'):
                 raise ValueError(f"Unsupported HTTP method: {method}")
 
-            # Raise an error for non-successful responses
-            response.raise_for_status()
-            response_data = response.json()
-            
+            response_data = await self._request_with_retries(method, url, headers, params, data)
+
             # Cache and return the successful response
-            self.cache.set(cache_key, response_data)
+            await self.cache.aset(cache_key, response_data)
             return response_data
 
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
             error_message = f"API request failed: {str(e)}"
-            self.error_logger.log(error_message)
+            self.error_logger.log_error(error_message)
+
+            # Serve the last known response rather than failing outright, if one is available
+            stale_response = await self.cache.aget_stale(cache_key)
+            if stale_response is not None:
+                return stale_response
             return {"error": error_message}
 
+    async def _request_with_retries(self, method: str, url: str, headers: dict, params: dict, data: dict) -> dict:
+        """
+        Sends a request, retrying connection errors, timeouts and 5xx responses with exponential backoff.
+        """
+        session = self._get_session()
+        for attempt in range(self.MAX_RETRIES + 1):
+            last_attempt = attempt == self.MAX_RETRIES
+            try:
+                async with session.request(method, url, headers=headers, params=params,
+                                           json=data if method == 'POST' else None) as response:
+                    if response.status in self.RETRY_STATUSES and not last_attempt:
+                        await asyncio.sleep(self.BACKOFF_FACTOR * (2 ** attempt))
+                        continue
+                    # Raise an error for non-successful responses
+                    response.raise_for_status()
+                    # Parse the raw bytes directly instead of decoding to str for the stdlib parser
+                    return orjson.loads(await response.read())
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if last_attempt:
+                    raise
+                await asyncio.sleep(self.BACKOFF_FACTOR * (2 ** attempt))
+
     def generate_cache_key(self, url: str, method: str, params: dict, data: dict) -> str:
         """
         Generates a unique cache key for each API request.
+        Params and data are serialized with sorted keys so equivalent requests share a key.
         """
-        return f"{method}_{url}_{str(params)}_{str(data)}"
+        payload = orjson.dumps([method.upper(), url, params or {}, data or {}], option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
 
     def clear_cache(self):
         """
@@ -62,4 +105,14 @@ class APIConnector:
         """
         Updates session headers with custom values.
         """
-        self.session.headers.update(headers)
\ No newline at end of file
+        self.headers.update(headers)
+        if self.session is not None and not self.session.closed:
+            self.session.headers.update(headers)
+
+    async def close(self):
+        """
+        Closes the client session and releases its pooled connections.
+        """
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
\ No newline at end of file
@@ -1,35 +1,171 @@
-from datetime import datetime, timedelta
+import asyncio
+import threading
+import time
+import orjson
+from cachetools import TTLCache
+
+try:
+    import redis  # Optional second-tier cache shared across processes
+except ImportError:
+    redis = None
 
 class CacheManager:
     """
     A simple cache manager that stores data in memory for a limited time.
+    When a Redis URL is given, entries are also written to Redis so other processes
+    (or a restarted one) can reuse them. Configure the Redis server with an LFU
+    maxmemory-policy (e.g. allkeys-lfu) to keep hot keys resident.
     """
-    def __init__(self, expiration_seconds: int = 300):
-        self.cache = {}
+    def __init__(self, expiration_seconds: int = 300, max_entries: int = 1024, redis_url: str = None,
+                 namespace: str = "cache", stale_seconds: int = 86400):
         self.expiration_seconds = expiration_seconds
+        self.stale_seconds = stale_seconds  # How long a stale copy is kept in Redis for fallback use
+        self.namespace = namespace
+        # TTLCache expires entries on a monotonic clock and evicts least-recently-used entries once full
+        self.cache = TTLCache(maxsize=max_entries, ttl=expiration_seconds, timer=time.monotonic)
+        # TTLCache isn't thread-safe (even reads expire and reorder entries), so every access holds this lock
+        self._lock = threading.Lock()
+        # Key -> lock held by the one caller currently loading that key in get_or_load
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+        self.redis = None
+        if redis_url:
+            if redis is None:
+                raise ImportError("The 'redis' package is required for a Redis-backed cache.")
+            self.redis = redis.Redis.from_url(redis_url)
+
+    def _redis_key(self, key: str, stale: bool = False) -> str:
+        return f"{self.namespace}:stale:{key}" if stale else f"{self.namespace}:{key}"
+
+    def _redis_get(self, redis_key: str):
+        """Reads and decodes one Redis entry, treating Redis errors as a miss."""
+        try:
+            payload = self.redis.get(redis_key)
+        except redis.RedisError:
+            return None
+        return orjson.loads(payload) if payload is not None else None
+
+    def _redis_set(self, key: str, payload: bytes):
+        """Writes an entry and its longer-lived stale copy to Redis."""
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.set(self._redis_key(key), payload, ex=self.expiration_seconds)
+            pipe.set(self._redis_key(key, stale=True), payload, ex=self.stale_seconds)
+            pipe.execute()
+        except redis.RedisError:
+            pass  # The in-memory tier still holds the value
 
     def set(self, key: str, value: dict):
         """
         Stores a value in the cache with an expiration time.
         """
-        expiration_time = datetime.now() + timedelta(seconds=self.expiration_seconds)
-        self.cache[key] = {"value": value, "expires_at": expiration_time}
+        with self._lock:
+            self.cache[key] = value
+        if self.redis is not None:
+            self._redis_set(key, orjson.dumps(value))
 
     def get(self, key: str):
         """
         Retrieves a value from the cache if it has not expired.
+        Falls back to Redis on a local miss and repopulates the local tier on a hit.
+        """
+        with self._lock:
+            value = self.cache.get(key)
+        if value is None and self.redis is not None:
+            value = self._redis_get(self._redis_key(key))
+            if value is not None:
+                with self._lock:
+                    self.cache[key] = value
+        return value
+
+    async def aget(self, key: str):
+        """
+        Async variant of get for event-loop callers: the local tier is read on the loop,
+        and only the Redis lookup on a miss runs in a worker thread.
+        """
+        with self._lock:
+            value = self.cache.get(key)
+        if value is None and self.redis is not None:
+            value = await asyncio.to_thread(self._redis_get, self._redis_key(key))
+            if value is not None:
+                with self._lock:
+                    self.cache[key] = value
+        return value
+
+    async def aset(self, key: str, value: dict):
+        """
+        Async variant of set for event-loop callers; only the Redis write runs in a worker thread.
+        """
+        with self._lock:
+            self.cache[key] = value
+        if self.redis is not None:
+            await asyncio.to_thread(self._redis_set, key, orjson.dumps(value))
+
+    def get_stale(self, key: str):
+        """
+        Retrieves the last stored value for a key even if it has expired from the main cache.
+        Used as a fallback when refreshing the value fails.
+        """
+        if self.redis is None:
+            return None
+        return self._redis_get(self._redis_key(key, stale=True))
+
+    async def aget_stale(self, key: str):
+        """
+        Async variant of get_stale for event-loop callers; the Redis lookup runs in a worker thread.
+        """
+        if self.redis is None:
+            return None
+        return await asyncio.to_thread(self._redis_get, self._redis_key(key, stale=True))
+
+    def get_or_load(self, key: str, loader):
+        """
+        Returns the cached value for a key, calling loader() to produce and cache it on a miss.
+        Concurrent misses on the same key are single-flighted: one caller loads while the others
+        wait and then read the freshly cached value. None results are not cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._inflight_lock:
+            lock = self._inflight.setdefault(key, threading.Lock())
+        with lock:
+            try:
+                value = self.get(key)  # Loaded by another caller while this one waited
+                if value is None:
+                    value = loader()
+                    if value is not None:
+                        self.set(key, value)
+                return value
+            finally:
+                with self._inflight_lock:
+                    if self._inflight.get(key) is lock:
+                        del self._inflight[key]
+
+    def delete(self, key: str):
+        """
+        Removes a value from the cache if present.
         """
-        cached_data = self.cache.get(key)
-        if cached_data:
-            if datetime.now() < cached_data["expires_at"]:
-                return cached_data["value"]
-            else:
-                # Remove expired data
-                del self.cache[key]
-        return None
+        with self._lock:
+            self.cache.pop(key, None)
+        if self.redis is not None:
+            try:
+                self.redis.delete(self._redis_key(key), self._redis_key(key, stale=True))
+            except redis.RedisError:
+                pass
 
     def clear(self):
         """
         Clears all cached data.
         """
-        self.cache.clear()
\ No newline at end of file
+        with self._lock:
+            self.cache.clear()
+        if self.redis is not None:
+            try:
+                keys = list(self.redis.scan_iter(match=f"{self.namespace}:*"))
+                if keys:
+                    self.redis.delete(*keys)
+            except redis.RedisError:
+                pass
\ No newline at end of file
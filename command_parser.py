@@ -1,22 +1,39 @@
 # command_parser.py
 
-from typing import Dict, Any, Tuple
-from nlp_processing import NLPProcessing
-from knowledge_manager import KnowledgeManager
-from task_scheduler import TaskScheduler
-from emotional_analysis import EmotionalAnalysis
-from utility_functions import clean_text
+import functools
+from typing import Dict, Any, Tuple, TYPE_CHECKING
+from utility_functions import clean_text, lazy_instance
 
-# Initialize dependent modules
-nlp_processor = NLPProcessing()
-knowledge_manager = KnowledgeManager()
-task_scheduler = TaskScheduler()
-emotional_analysis = EmotionalAnalysis()
+if TYPE_CHECKING:
+    from nlp_processing import NLPProcessing
+    from knowledge_manager import KnowledgeManager
+    from task_scheduler import TaskScheduler
+    from emotional_analysis import EmotionalAnalysis
 
 class CommandParser:
-    def __init__(self):
+    PARSE_CACHE_SIZE = 1024  # Distinct normalized commands whose parse results are kept
+
+    def __init__(self, nlp: "NLPProcessing" = None, km: "KnowledgeManager" = None,
+                 ts: "TaskScheduler" = None, ea: "EmotionalAnalysis" = None):
+        """
+        Args:
+            nlp, km, ts, ea: Shared module instances. Any that are omitted are created on first use,
+                so models are not loaded at import time or duplicated across components.
+        """
+        self._nlp = nlp or lazy_instance("nlp_processing", "NLPProcessing")
+        self._knowledge_manager = km or lazy_instance("knowledge_manager", "KnowledgeManager")
+        self._task_scheduler = ts or lazy_instance("task_scheduler", "TaskScheduler")
+        self._emotional_analysis = ea or lazy_instance("emotional_analysis", "EmotionalAnalysis")
         # To store context if follow-up commands are expected
         self.context = {}
+        # Repeated commands ("yes", "thanks", "help") skip the NLP models entirely
+        self._parse_normalized = functools.lru_cache(maxsize=self.PARSE_CACHE_SIZE)(self._parse_uncached)
+        # Intent -> handler returning (result_type, result_data)
+        self._routes = {
+            "definition": lambda keywords: ("knowledge", self._knowledge_manager.retrieve_definition(keywords)),
+            "recommendation": lambda keywords: ("recommendation", self._knowledge_manager.get_recommendations(keywords)),
+            "creation": lambda keywords: ("task", self._task_scheduler.create_task(keywords)),
+        }
 
     # ---- 1. Parse Command ----
     def parse_command(self, text: str) -> Dict[str, Any]:
@@ -28,16 +45,29 @@ class CommandParser:
             Dict[str, Any]: Parsed intent, keywords, and additional info.
         """
         text = clean_text(text)  # Normalize the text
-        parsed_data = nlp_processor.parse_intent(text)
-        
-        # Analyze sentiment to adjust Mia’s responses (optional)
-        sentiment = nlp_processor.analyze_sentiment(text)
-        parsed_data["sentiment"] = sentiment
-        
+        intent, keywords, original_text, sentiment = self._parse_normalized(text)
+        # Build a fresh dict each call so callers can't mutate the cached result
+        parsed_data = {
+            "intent": intent,
+            "keywords": list(keywords),
+            "original_text": original_text,
+            "sentiment": dict(sentiment),
+        }
+
         # Store the parsed context for potential follow-up
         self.context["last_command"] = parsed_data
         return parsed_data
 
+    def _parse_uncached(self, text: str) -> Tuple:
+        """
+        Runs intent and sentiment analysis on normalized text.
+        Returns an immutable tuple so the result can be shared from the LRU cache.
+        """
+        parsed = self._nlp.parse_intent(text)
+        # Analyze sentiment to adjust Mia’s responses (optional)
+        sentiment = self._nlp.analyze_sentiment(text)
+        return parsed["intent"], tuple(parsed["keywords"]), parsed["original_text"], tuple(sentiment.items())
+
     # ---- 2. Route Command ----
     def route_to_module(self, parsed_data: Dict[str, Any]) -> Tuple[str, Any]:
         """
@@ -51,17 +81,10 @@ class CommandParser:
         keywords = parsed_data.get("keywords", [])
         
         # Determine routing based on intent
-        if intent == "definition":
-            return "knowledge", knowledge_manager.retrieve_definition(keywords)
-        
-        elif intent == "recommendation":
-            return "recommendation", knowledge_manager.get_recommendations(keywords)
-        
-        elif intent == "creation":
-            return "task", task_scheduler.create_task(keywords)
-        
-        else:
-            return "fallback", self.fallback_handler(parsed_data)
+        handler = self._routes.get(intent)
+        if handler:
+            return handler(keywords)
+        return "fallback", self.fallback_handler(parsed_data)
 
     # ---- 3. Handle Follow-Up Commands ----
     def handle_follow_up(self, text: str) -> Tuple[str, Any]:
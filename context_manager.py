@@ -1,20 +1,82 @@
 import datetime
+import functools
+import heapq
 import time
-import json
+import orjson
 import os
+import re
+from collections import Counter, deque
+from itertools import islice
+from types import MappingProxyType
+
+# Activity -> keywords used to infer it from recent interactions, checked in priority order
+_ACTIVITY_KEYWORDS = (
+    ("work", frozenset({"meeting", "email"})),
+    ("leisure", frozenset({"relax", "movie"})),
+)
+_TOKEN_RE = re.compile(r"\w+")
+
+# Hour of day -> index into _TIME_OF_DAY_NAMES
+_TIME_OF_DAY_TABLE = bytes([3] * 5 + [0] * 7 + [1] * 5 + [2] * 4 + [3] * 3)
+_TIME_OF_DAY_NAMES = ("morning", "afternoon", "evening", "night")
+
+
+def _encode_default(obj):
+    """Serializes the types orjson doesn't handle natively; recent_interactions is a deque."""
+    if isinstance(obj, deque):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+# Encoders built once with their options and default hook bound, reused by every save.
+# Keys are sorted so the same context always serializes to the same bytes, whatever its insertion order.
+_encode_value = functools.partial(orjson.dumps, default=_encode_default, option=orjson.OPT_SORT_KEYS)
+_encode_snapshot = functools.partial(orjson.dumps, default=_encode_default,
+                                     option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+
+
+def _tokenize(text):
+    """Returns the set of lowercase word tokens in an interaction."""
+    return set(_TOKEN_RE.findall(text.lower()))
 
 class ContextManager:
     CONTEXT_PRIORITY = ["activity", "time_of_day", "preferences", "temporary_state"]
+    MAX_RECENT_INTERACTIONS = 10
+    ACTIVITY_WINDOW = 5  # Number of recent interactions considered for activity inference
+
+    TIME_OF_DAY_TTL = 60  # Seconds a computed time of day is reused
+    JOURNAL_COMPACT_RATIO = 2  # Rewrite the snapshot once the journal outgrows it by this factor
 
     def __init__(self, context_file="context.json"):
         self.context_file = context_file
+        # Append-only log of changed top-level keys written since the last snapshot
+        self.journal_file = context_file + ".log"
+        # Top-level key -> serialized value as last persisted, to find what changed
+        self._persisted = {}
+        self._time_of_day = None
+        self._time_of_day_at = float("-inf")
         self.context_data = {
             "activity": None,
             "time_of_day": None,
-            "recent_interactions": [],
+            "recent_interactions": deque(maxlen=self.MAX_RECENT_INTERACTIONS),
             "preferences": {},
             "temporary_state": {}
         }
+        # Token sets for recent_interactions, index-aligned with it so evictions never re-tokenize
+        self._interaction_tokens = deque(maxlen=self.MAX_RECENT_INTERACTIONS)
+        # Token -> number of interactions in the activity window containing it
+        self._recent_tokens = Counter()
+        # Min-heap of (expiry, key) for lazily removing expired temporary states
+        self._expiry_heap = []
+        # Prioritized context, refreshed in place by get_context and exposed read-only
+        self._context = {}
+        self._context_view = MappingProxyType(self._context)
+        # Bumped whenever the context changes, so callers can tell snapshots apart without copying
+        self._version = 0
+        self._event_handlers = {
+            "login": lambda: (self.update_context("activity", "starting_day"), self.clear_context()),
+            "logout": self.save_context
+        }
         self.load_context()
 
     # --- Core Context Functions ---
@@ -27,39 +89,59 @@ class ContextManager:
         - user_input: str, input text from user, if available.
         
         Returns:
-        - dict, the context relevant to the conversation.
+        - mapping, a read-only view of the context relevant to the conversation.
+          The view is live; copy it with dict() to keep a snapshot.
         """
         self.context_data["time_of_day"] = self.get_time_of_day()
         self.infer_activity_from_interactions()
+        self._purge_expired_states()
 
-        # Build context with only prioritized fields that are non-null
-        context = {
-            key: value
-            for key, value in self.context_data.items()
-            if key in self.CONTEXT_PRIORITY and value is not None
-        }
-        context["temporary_state"] = {
-            k: v for k, v in self.context_data["temporary_state"].items()
-            if v["expiry"] > time.time()
-        }
+        # Refresh the context in place with only prioritized fields that are non-null
+        context = self._context
+        had_status = context.pop("status", None) is not None
+        changed = False
+        for key in self.CONTEXT_PRIORITY:
+            value = self.context_data.get(key)
+            if value is None:
+                changed |= context.pop(key, None) is not None
+            elif context.get(key) is not value:
+                context[key] = value
+                changed = True
 
         # If there's no active context, assume a default state
-        if not any(context.values()):
+        has_status = not any(context.values())
+        if has_status:
             context["status"] = "no_active_context"
+        if changed or had_status != has_status:
+            self._version += 1
 
         if user_input:
             self.update_recent_interactions(user_input)
 
-        return context
+        return self._context_view
+
+    def get_context_view(self, user_input=None):
+        """
+        Returns the read-only context view from get_context together with its version.
+        The version only changes when the context does, so it can stand in for a copy.
+        """
+        view = self.get_context(user_input)
+        return view, self._version
 
     def update_context(self, key, value):
         """
         Updates context data with error handling and conditional insertion.
         Supports handling nested dictionaries for specific keys.
         """
+        self._version += 1
         if key == "recent_interactions":
-            if isinstance(value, dict) and len(self.context_data[key]) < 10:  # Limit stored interactions
+            if isinstance(value, str):  # Bounded deque drops the oldest interaction once full
+                tokens = _tokenize(value)
                 self.context_data[key].append(value)
+                self._interaction_tokens.append(tokens)
+                self._recent_tokens.update(tokens)
+                if len(self._interaction_tokens) > self.ACTIVITY_WINDOW:
+                    self._forget_tokens(self._interaction_tokens[-self.ACTIVITY_WINDOW - 1])
         elif key in self.context_data:
             if isinstance(self.context_data[key], dict) and isinstance(value, dict):
                 self.context_data[key].update(value)
@@ -71,52 +153,108 @@ class ContextManager:
         Resets specific context fields to defaults, preserving certain user preferences.
         Only removes expired temporary states.
         """
+        self._version += 1
         self.context_data.update({
             "activity": None,
-            "time_of_day": self.get_time_of_day(),
-            "recent_interactions": []
+            "time_of_day": self.get_time_of_day()
         })
+        self.context_data["recent_interactions"].clear()
+        self._interaction_tokens.clear()
+        self._recent_tokens.clear()
         # Remove only expired states from temporary_state
-        self.context_data["temporary_state"] = {
-            k: v for k, v in self.context_data["temporary_state"].items()
-            if v["expiry"] > time.time()
-        }
+        self._purge_expired_states()
 
     # --- Helper Functions ---
     def get_time_of_day(self):
         """
-        Determines time of day with advanced conditional logic based on hour intervals.
+        Determines time of day from the current hour, recomputing at most once per TIME_OF_DAY_TTL seconds.
         """
-        hour = datetime.datetime.now().hour
-        return (
-            "morning" if 5 <= hour < 12
-            else "afternoon" if 12 <= hour < 17
-            else "evening" if 17 <= hour < 21
-            else "night"
-        )
+        now = time.monotonic()
+        if now - self._time_of_day_at >= self.TIME_OF_DAY_TTL:
+            self._time_of_day = _TIME_OF_DAY_NAMES[_TIME_OF_DAY_TABLE[datetime.datetime.now().hour]]
+            self._time_of_day_at = now
+        return self._time_of_day
 
     def save_context(self):
         """
-        Saves the current context to a file with error handling.
+        Saves the current context with error handling.
+        Only top-level keys that changed since the last save are appended to the journal;
+        the full snapshot is rewritten when the journal grows too large or no snapshot exists.
         If save fails, logs error for review without terminating program.
         """
         try:
-            with open(self.context_file, 'w') as f:
-                json.dump(self.context_data, f, ensure_ascii=False, indent=4)
+            serialized = {key: _encode_value(value) for key, value in self.context_data.items()}
+            changed = [key for key, payload in serialized.items() if self._persisted.get(key) != payload]
+            if not changed:
+                return
+
+            snapshot_size = os.path.getsize(self.context_file) if os.path.exists(self.context_file) else 0
+            journal_size = os.path.getsize(self.journal_file) if os.path.exists(self.journal_file) else 0
+            if not snapshot_size or journal_size > self.JOURNAL_COMPACT_RATIO * snapshot_size:
+                self._write_snapshot()
+            else:
+                now = time.time()
+                with open(self.journal_file, 'ab') as f:
+                    f.write(b"".join(
+                        b'{"op":"set","key":%s,"value":%s,"ts":%s}\n' % (orjson.dumps(key), serialized[key], orjson.dumps(now))
+                        for key in changed
+                    ))
+            self._persisted = serialized
         except IOError as e:
             print(f"Error saving context: {e}")
 
+    def _write_snapshot(self):
+        """
+        Atomically replaces the snapshot with the full context and discards the journal it supersedes.
+        """
+        tmp_file = self.context_file + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(_encode_snapshot(self.context_data))
+        os.replace(tmp_file, self.context_file)
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+
+    def _replay_journal(self):
+        """
+        Applies journaled updates on top of the loaded snapshot, in the order they were written.
+        A partially written final line (e.g. after a crash) is ignored.
+        """
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    event = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    break
+                if event.get("op") == "set":
+                    self.context_data[event["key"]] = event["value"]
+
     def load_context(self):
         """
         Loads context from a file if it exists, else initializes time of day.
         """
         try:
             if os.path.exists(self.context_file):
-                with open(self.context_file, 'r') as f:
-                    self.context_data = json.load(f)
+                with open(self.context_file, 'rb') as f:
+                    self.context_data = orjson.loads(f.read())
+                self._replay_journal()
+                self._persisted = {key: _encode_value(value) for key, value in self.context_data.items()}
+                self.context_data["recent_interactions"] = deque(
+                    self.context_data.get("recent_interactions", []), maxlen=self.MAX_RECENT_INTERACTIONS
+                )
+                self._interaction_tokens = deque(
+                    map(_tokenize, self.context_data["recent_interactions"]), maxlen=self.MAX_RECENT_INTERACTIONS
+                )
+                self._recent_tokens = Counter()
+                for tokens in islice(self._interaction_tokens, max(0, len(self._interaction_tokens) - self.ACTIVITY_WINDOW), None):
+                    self._recent_tokens.update(tokens)
+                self._expiry_heap = [(state["expiry"], key) for key, state in self.context_data["temporary_state"].items()]
+                heapq.heapify(self._expiry_heap)
+                self._version += 1
             else:
                 self.context_data["time_of_day"] = self.get_time_of_day()
-        except (IOError, json.JSONDecodeError) as e:
+        except (IOError, orjson.JSONDecodeError) as e:
             print(f"Error loading context: {e}")
             self.context_data["time_of_day"] = self.get_time_of_day()
 
@@ -125,23 +263,38 @@ class ContextManager:
         """
         Analyzes recent interactions to infer current activity with complex pattern matching.
         """
-        recent_texts = " ".join(self.get_recent_interactions())
-        activity = (
-            "work" if any(keyword in recent_texts for keyword in ["meeting", "email"])
-            else "leisure" if any(keyword in recent_texts for keyword in ["relax", "movie"])
-            else None
+        tokens = self._recent_tokens.keys()
+        self.context_data["activity"] = next(
+            (activity for activity, keywords in _ACTIVITY_KEYWORDS if not tokens.isdisjoint(keywords)),
+            None
         )
-        self.context_data["activity"] = activity
 
     def set_temporary_state(self, key, value, duration=1800):
         """
         Sets a temporary state with expiry.
         If a temporary state already exists for the key, extends the duration.
         """
+        self._version += 1
         if key in self.context_data["temporary_state"]:
             self.context_data["temporary_state"][key]["expiry"] += duration
         else:
             self.context_data["temporary_state"][key] = {"value": value, "expiry": time.time() + duration}
+        heapq.heappush(self._expiry_heap, (self.context_data["temporary_state"][key]["expiry"], key))
+
+    def _purge_expired_states(self):
+        """
+        Pops expired entries off the expiry heap and drops their temporary states.
+        Heap entries left behind by extended or removed states are skipped.
+        """
+        now = time.time()
+        heap = self._expiry_heap
+        states = self.context_data["temporary_state"]
+        while heap and heap[0][0] <= now:
+            _, key = heapq.heappop(heap)
+            state = states.get(key)
+            if state and state["expiry"] <= now:
+                del states[key]
+                self._version += 1
 
     def get_temporary_state(self, key):
         """
@@ -152,6 +305,7 @@ class ContextManager:
             if state["expiry"] > time.time():
                 return state["value"]
             del self.context_data["temporary_state"][key]
+            self._version += 1
         return None
 
     def handle_event(self, event):
@@ -159,25 +313,34 @@ class ContextManager:
         Processes specific events (e.g., login/logout) by adjusting context.
         Login resets activity, logout saves current context.
         """
-        event_handlers = {
-            "login": lambda: (self.update_context("activity", "starting_day"), self.clear_context()),
-            "logout": self.save_context
-        }
-        handler = event_handlers.get(event)
+        handler = self._event_handlers.get(event)
         if handler:
             handler()
 
+    def _forget_tokens(self, tokens):
+        """
+        Removes an interaction's tokens from the activity-window counts once it leaves the window.
+        """
+        for token in tokens:
+            remaining = self._recent_tokens[token] - 1
+            if remaining > 0:
+                self._recent_tokens[token] = remaining
+            else:
+                del self._recent_tokens[token]
+
     def get_recent_interactions(self, limit=5):
         """
         Retrieves a limited set of recent interactions for context inference.
         """
-        return [interaction for interaction in self.context_data["recent_interactions"][-limit:]]
+        interactions = self.context_data["recent_interactions"]
+        return list(islice(interactions, max(0, len(interactions) - limit), None))
 
     def add_preference(self, key, value):
         """
         Adds or updates a user preference.
         """
         self.context_data["preferences"][key] = value
+        self._version += 1
 
     def get_preferences(self):
         """
@@ -1,19 +1,26 @@
 from context_manager import ContextManager
 from feedback_processor import process_feedback, save_positive_response
 from learning_module import fetch_dynamic_response, save_response, adapt_response_patterns, train_from_feedback
-from nlp_processing import NLPProcessing
+from nlp_processing import NLPProcessing, NLUBatcher
 from emotional_analysis import EmotionalState, EmotionalAnalysis
 from response_middleware import ResponseMiddleware
 from shared_types import EmotionType
 
+
 class ConversationManager:
-    def __init__(self):
+    def __init__(self, emotion_analysis: EmotionalAnalysis = None):
+        """
+        Parameters:
+        - emotion_analysis: EmotionalAnalysis, optional instance shared with the caller so both drive one emotional state.
+        """
         self.context_manager = ContextManager()
         self.nlp_processing = NLPProcessing()
+        # Groups concurrent inputs into one NLP call when serving several users at once
+        self.nlu_batcher = NLUBatcher(self.nlp_processing)
         
         # Initialize emotional state, response generator, and middleware for fallback handling
         self.user_emotion = EmotionalState()
-        self.emotion_response = EmotionalAnalysis()
+        self.emotion_response = emotion_analysis or EmotionalAnalysis()
         self.response_middleware = ResponseMiddleware()
 
     def initiate_conversation(self):
@@ -38,9 +45,24 @@ class ConversationManager:
         Returns:
         - str, generated response considering emotion and context.
         """
-        # Update emotional state based on user input analysis
-        detected_emotion, intensity = self.nlp_processing.analyze_emotion(user_input)
-        self.user_emotion.update_emotion(detected_emotion, intensity)
+        # Analyze the input in a single combined NLP pass
+        return self._respond(user_input, self.nlp_processing.analyze_bundle(user_input))
+
+    async def process_user_input_async(self, user_input):
+        """
+        Same as process_user_input, but the NLP analysis is micro-batched with other concurrent inputs.
+        
+        Parameters:
+        - user_input: str, input text from user.
+        
+        Returns:
+        - str, generated response considering emotion and context.
+        """
+        return self._respond(user_input, await self.nlu_batcher.analyze(user_input))
+
+    def _respond(self, user_input, analysis):
+        """Updates emotional state from an analysis bundle and generates the response."""
+        self.user_emotion.update_emotion(analysis["emotion"], analysis["intensity"])
         
         # Generate response with current emotional context and user input context
         context = self.context_manager.get_context(user_input)
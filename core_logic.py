@@ -1,43 +1,65 @@
+import asyncio
+import inspect
 from typing import Dict, Any
-from datetime import datetime
 from command_parser import CommandParser
 from conversation_manager import ConversationManager
 from emotional_analysis import EmotionalAnalysis
 from task_scheduler import TaskScheduler
-from knowledge_manager import KnowledgeManager
-from self_optimizer import SelfOptimizer
 from security_manager import SecurityManager
-from api_connector import APIConnector
-from voice_interface import VoiceInterface
-import feedback_processor as FeedbackProcessor
-import learning_module as LearningModule
 from error_logger import ErrorLogger
 from data_storage import DataStorage
+from utility_functions import lazy_instance, current_timestamp
 
 class CoreLogic:
     def __init__(self):
-        # Initialize modules and dependencies
-        self.command_parser = CommandParser()
-        self.conversation_manager = ConversationManager()
+        # Initialize modules and dependencies; subsystems a session may never touch are imported on first use
         self.emotional_analysis = EmotionalAnalysis()
+        self.conversation_manager = ConversationManager(emotion_analysis=self.emotional_analysis)
         self.task_scheduler = TaskScheduler()
-        self.knowledge_manager = KnowledgeManager()
+        self.knowledge_manager = lazy_instance("knowledge_manager", "KnowledgeManager")
+        # Share the already-loaded NLP models and modules instead of letting the parser build its own
+        self.command_parser = CommandParser(
+            nlp=self.conversation_manager.nlp_processing,
+            km=self.knowledge_manager,
+            ts=self.task_scheduler,
+            ea=self.emotional_analysis,
+        )
         # Pass modules without parentheses to SelfOptimizer
-        self.self_optimizer = SelfOptimizer()
+        self.self_optimizer = lazy_instance("self_optimizer", "SelfOptimizer")
         self.security_manager = SecurityManager()
-        self.api_connector = APIConnector()
-        self.voice_interface = VoiceInterface()
+        self.api_connector = lazy_instance("api_connector", "APIConnector")
+        self.voice_interface = lazy_instance("voice_interface", "VoiceInterface")
         self.error_logger = ErrorLogger()
         self.data_storage = DataStorage()
         self.context = {}  # Store interaction context for ongoing sessions
+        # Intent -> handler taking the parsed command
+        self._routes = {
+            "information": self.handle_information_request,
+            "task_management": self.handle_task_management,
+            "emotional_response": self.handle_emotional_response,
+            "external_api": self.handle_external_api,
+            "voice_command": self.handle_voice_command,
+            "self_optimization": lambda parsed_command: self.initiate_self_optimization(parsed_command.get("context", {})),
+        }
+
+    def login(self, username: str, password: str) -> bool:
+        """
+        Checks the user's credentials and, if they match, opens a session whose token
+        process_input verifies on every later turn.
+        """
+        if not self.security_manager.verify_user(username, password):
+            return False
+        self.context["session_token"] = self.security_manager.create_session(username)
+        return True
 
-    def process_input(self, user_input: str) -> str:
+    async def process_input(self, user_input: str) -> str:
         """
         Primary handler for user input.
         - Validates user security.
         - Parses command, routes it to the correct module, and logs errors if any occur.
         """
-        if not self.security_manager.verify_user(user_input):
+        # Per-turn check is a session-token lookup; the password is only hashed at login
+        if not self.security_manager.verify_session(self.context.get("session_token")):
             return "User verification failed. Please authenticate."
 
         try:
@@ -50,7 +72,7 @@ class CoreLogic:
             if not self.command_parser.validate_command(parsed_command):
                 return "I didn't understand that command. Could you please rephrase?"
 
-            response = self.route_command(parsed_command)
+            response = await self.route_command(parsed_command)
             self.log_interaction(user_input, response)  # Log each interaction
             return response
 
@@ -58,27 +80,18 @@ class CoreLogic:
             self.error_logger.log_error("Error processing input", e)
             return "An error occurred while processing your request."
 
-    def route_command(self, parsed_command: Dict[str, Any]) -> str:
+    async def route_command(self, parsed_command: Dict[str, Any]) -> str:
         """
         Routes parsed commands to appropriate modules and adjusts based on sentiment, priority, and urgency.
+        I/O-bound handlers are coroutines and are awaited; the rest return their response directly.
         """
-        intent = parsed_command.get("intent")
-        context = parsed_command.get("context", {})
-        
-        if intent == "information":
-            return self.handle_information_request(parsed_command)
-        elif intent == "task_management":
-            return self.handle_task_management(parsed_command)
-        elif intent == "emotional_response":
-            return self.handle_emotional_response(parsed_command)
-        elif intent == "external_api":
-            return self.handle_external_api(parsed_command)
-        elif intent == "voice_command":
-            return self.handle_voice_command(parsed_command)
-        elif intent == "self_optimization":
-            return self.initiate_self_optimization(context)
-        else:
+        handler = self._routes.get(parsed_command.get("intent"))
+        if not handler:
             return self.conversation_manager.fallback_response()
+        response = handler(parsed_command)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
 
     def handle_information_request(self, parsed_command: Dict[str, Any]) -> str:
         """Handles requests for information retrieval, taking context and sentiment into account."""
@@ -116,13 +129,13 @@ class CoreLogic:
         response = self.conversation_manager.generate_response(mood_adjustment)
         return response
 
-    def handle_external_api(self, parsed_command: Dict[str, Any]) -> str:
-        """Processes API-related commands and error handling."""
+    async def handle_external_api(self, parsed_command: Dict[str, Any]) -> str:
+        """Processes API-related commands and error handling without blocking the event loop."""
         api_name = parsed_command.get("api_name")
         params = parsed_command.get("parameters", {})
         
         try:
-            response = self.api_connector.fetch_data(api_name, params)
+            response = await self.api_connector.fetch_data(api_name, params)
             return f"Data from {api_name}: {response}"
         except Exception as e:
             self.error_logger.log_error(f"API Error - {api_name}", e)
@@ -139,16 +152,24 @@ class CoreLogic:
         else:
             return "Voice command not recognized."
 
-    def initiate_self_optimization(self, context: Dict[str, Any]) -> str:
-        """Triggers Mia's self-optimization routine based on recent interactions and feedback."""
+    async def initiate_self_optimization(self, context: Dict[str, Any]) -> str:
+        """
+        Triggers Mia's self-optimization routine based on recent interactions and feedback.
+        Loading the interactions and analyzing feedback are independent, so they run concurrently
+        in worker threads; training waits for the interactions.
+        """
         feedback = context.get("feedback")
-        interaction_data = self.data_storage.retrieve_data("recent_interactions")
 
-        if feedback:
-            self.self_optimizer.analyze_feedback_trends()
+        async def refresh_response_patterns():
+            await asyncio.to_thread(self.self_optimizer.analyze_feedback_trends)
             self.self_optimizer.update_response_patterns({"common_issues": feedback})
 
-        self.self_optimizer.train_from_interactions(interaction_data)
+        jobs = [asyncio.to_thread(self.data_storage.retrieve_data, "recent_interactions")]
+        if feedback:
+            jobs.append(refresh_response_patterns())
+        interaction_data, *_ = await asyncio.gather(*jobs)
+
+        await asyncio.to_thread(self.self_optimizer.train_from_interactions, interaction_data)
         return "Self-optimization initiated based on recent feedback and interactions."
 
     def feedback_loop(self, user_feedback: str) -> None:
@@ -172,7 +193,7 @@ class CoreLogic:
     def log_interaction(self, user_input: str, response: str) -> None:
         """Logs user interactions for feedback analysis."""
         interaction_data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": current_timestamp(),
             "input": user_input,
             "response": response
         }
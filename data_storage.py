@@ -1,5 +1,10 @@
-import json
+import atexit
+import mmap
+import orjson
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 from error_logger import ErrorLogger
 from cache_manager import CacheManager
@@ -7,39 +12,137 @@ from cache_manager import CacheManager
 class DataStorage:
     """
     Manages data storage with in-memory caching, persistent file storage, and error logging.
+    Updates are appended to a journal next to the storage file and folded into it by save_data.
+    Journal writes happen on a background thread so callers never wait on disk I/O.
     """
-    
-    def __init__(self, storage_file: str = 'data_storage.json', cache_expiration: int = 600):
+
+    JOURNAL_COMPACT_RATIO = 2  # Compact once the journal outgrows the snapshot by this factor
+    JOURNAL_BUFFER_SIZE = 1 << 16
+    FLUSH_BATCH_SIZE = 100  # Most updates written per journal write
+    FLUSH_INTERVAL = 0.05  # Seconds the writer waits to gather a batch
+
+    def __init__(self, storage_file: str = 'data_storage.json', cache_expiration: int = 600, cache_entries: int = 8192):
         self.storage_file = storage_file
+        self.journal_file = storage_file + '.log'
+        self._journal = None  # Append handle, opened on first write
+        self._io_lock = threading.RLock()  # Serializes journal writes and compaction
         self.error_logger = ErrorLogger()
-        self.cache = CacheManager(expiration_seconds=cache_expiration)
+        self.cache = CacheManager(expiration_seconds=cache_expiration, max_entries=cache_entries)
         
         # Load data from file or initialize with an empty structure
         self.data = self.load_data()
 
+        self._queue = queue.Queue()
+        threading.Thread(target=self._writer, name="DataStorageWriter", daemon=True).start()
+        # The writer is a daemon thread, so queued updates are written out before the interpreter exits
+        atexit.register(self.close)
+
     def load_data(self) -> dict:
         """
-        Loads data from a JSON file into memory.
+        Loads data from a JSON file into memory and replays any journaled updates on top of it.
         """
         try:
-            if os.path.exists(self.storage_file):
-                with open(self.storage_file, 'r') as file:
-                    data = json.load(file)
-                    return data
-            return {}
+            data = {}
+            if os.path.exists(self.storage_file) and os.path.getsize(self.storage_file):
+                # Parse straight from the page cache instead of copying the file into a bytes object first
+                with open(self.storage_file, 'rb') as file, \
+                        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        data = orjson.loads(view)
+                    finally:
+                        view.release()
+            if os.path.exists(self.journal_file):
+                with open(self.journal_file, 'rb') as file:
+                    for line in file:
+                        try:
+                            event = orjson.loads(line)
+                        except orjson.JSONDecodeError:
+                            break  # Partially written final line
+                        if event["op"] == "set":
+                            data[event["k"]] = event["v"]
+                        elif event["op"] == "del":
+                            data.pop(event["k"], None)
+            return data
         except Exception as e:
-            self.error_logger.log(f"Failed to load data: {e}")
+            self.error_logger.log_error(f"Failed to load data: {e}")
             return {}
 
     def save_data(self):
         """
-        Saves the in-memory data to a JSON file.
+        Atomically rewrites the JSON file from the in-memory data and truncates the journal.
+        Updates still queued for the journal are replayed harmlessly on top of the new snapshot.
         """
         try:
-            with open(self.storage_file, 'w') as file:
-                json.dump(self.data, file, indent=4)
+            with self._io_lock:
+                tmp_file = self.storage_file + '.tmp'
+                with open(tmp_file, 'wb') as file:
+                    file.write(orjson.dumps(self.data, option=orjson.OPT_INDENT_2))
+                os.replace(tmp_file, self.storage_file)
+                self._close_journal()
+                if os.path.exists(self.journal_file):
+                    os.remove(self.journal_file)
         except Exception as e:
-            self.error_logger.log(f"Failed to save data: {e}")
+            self.error_logger.log_error(f"Failed to save data: {e}")
+
+    def _writer(self):
+        """
+        Background loop that drains queued updates in batches and journals each batch with one write.
+        """
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while len(batch) < self.FLUSH_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                # Only the latest update to each key in a batch needs to reach disk
+                self._append_journal({event["k"]: event for event in batch}.values())
+            except Exception as e:
+                # Keep the writer alive, or every later update would be lost and flush() would never return
+                self.error_logger.log_error(f"Failed to journal update: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _append_journal(self, events):
+        """
+        Appends updates to the journal, compacting into the JSON file once the journal grows too large.
+        """
+        try:
+            with self._io_lock:
+                if self._journal is None:
+                    self._journal = open(self.journal_file, 'ab', buffering=self.JOURNAL_BUFFER_SIZE)
+                self._journal.write(b"".join(orjson.dumps(event, option=orjson.OPT_APPEND_NEWLINE) for event in events))
+                self._journal.flush()
+                snapshot_size = os.path.getsize(self.storage_file) if os.path.exists(self.storage_file) else 0
+                if self._journal.tell() > self.JOURNAL_COMPACT_RATIO * snapshot_size:
+                    self.save_data()
+        except Exception as e:
+            self.error_logger.log_error(f"Failed to journal update: {e}")
+
+    def flush(self):
+        """
+        Blocks until every queued update has been written to the journal.
+        """
+        self._queue.join()
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def close(self):
+        """
+        Writes pending updates, folds the journal into the JSON file and releases the journal handle.
+        """
+        self.flush()
+        self.save_data()
 
     def add_entry(self, key: str, value: dict):
         """
@@ -47,19 +150,14 @@ class DataStorage:
         """
         self.data[key] = value
         self.cache.set(key, value)  # Cache the entry
-        self.save_data()
+        self._queue.put({"op": "set", "k": key, "v": value})  # Journaled by the writer thread
 
     def get_entry(self, key: str) -> dict:
         """
         Retrieves an entry by key, checking the cache first.
         """
-        # Check if the data is in cache
-        cached_value = self.cache.get(key)
-        if cached_value:
-            return cached_value
-        
-        # If not in cache, fetch from data storage
-        return self.data.get(key, None)
+        # On a cache miss, fetch from data storage once even if several callers miss together
+        return self.cache.get_or_load(key, lambda: self.data.get(key, None))
 
     def delete_entry(self, key: str):
         """
@@ -68,7 +166,7 @@ class DataStorage:
         if key in self.data:
             del self.data[key]
             self.cache.delete(key)
-            self.save_data()
+            self._queue.put({"op": "del", "k": key})
 
     def list_entries(self) -> dict:
         """
@@ -78,16 +176,17 @@ class DataStorage:
 
     def backup_data(self):
         """
-        Creates a timestamped backup of the data file.
+        Creates a timestamped backup of the data file, compacting the journal first.
         """
+        self.save_data()
         timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
         backup_file = f"{self.storage_file}_{timestamp}.bak"
         try:
-            with open(backup_file, 'w') as file:
-                json.dump(self.data, file, indent=4)
+            with open(backup_file, 'wb') as file:
+                file.write(orjson.dumps(self.data, option=orjson.OPT_INDENT_2))
             return f"Backup created: {backup_file}"
         except Exception as e:
-            self.error_logger.log(f"Failed to create backup: {e}")
+            self.error_logger.log_error(f"Failed to create backup: {e}")
             return "Backup failed"
 
     def load_user_profile(self, user_id: str = "user_profile") -> dict:
@@ -102,7 +201,7 @@ class DataStorage:
                 return {}
             return user_profile
         except Exception as e:
-            self.error_logger.log(f"Failed to load user profile: {e}")
+            self.error_logger.log_error(f"Failed to load user profile: {e}")
             return {}
 
 # Example usage
@@ -1,12 +1,48 @@
-from random import choice
+from bisect import bisect_right
+import functools
+from operator import itemgetter
+import random
 import re
 import feedback_processor
 import context_manager
 import learning_module
 from shared_types import EmotionType
 
+try:
+    import ahocorasick  # Optional: scans for every emotion keyword in one pass
+except ImportError:
+    ahocorasick = None
+
+
+def _build_keyword_automaton(emotion_keywords):
+    """
+    Builds an Aho-Corasick automaton mapping each keyword to (priority, emotion, length).
+    Priority follows the order of emotion_keywords so the first listed emotion wins ties.
+    Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for priority, (emotion, keywords) in enumerate(emotion_keywords.items()):
+        for keyword in keywords:
+            automaton.add_word(keyword, (priority, emotion, len(keyword)))
+    automaton.make_automaton()
+    return automaton
+
+
+_WORD_RE = re.compile(r"\w+")
+
+# Intensity bucket boundaries and the level each bucket maps to
+_INTENSITY_THRESHOLDS = (0.3, 0.7)
+_INTENSITY_LEVELS = ("low", "medium", "high")
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
 class EmotionalState:
     """Represents the emotional state of the user."""
+    __slots__ = ("emotion", "intensity")
     
     def __init__(self, emotion=EmotionType.NEUTRAL, intensity=0.5):
         self.emotion = emotion
@@ -25,36 +61,36 @@ class EmotionalAnalysis:
 
     RESPONSE_MAP = {
         EmotionType.HAPPY: {
-            'low': ["I'm glad to see you’re in a good mood!"],
-            'medium': ["That's wonderful! Keep up the positive vibes!"],
-            'high': ["Your happiness is contagious! Spread the joy!"]
+            'low': ("I'm glad to see you’re in a good mood!",),
+            'medium': ("That's wonderful! Keep up the positive vibes!",),
+            'high': ("Your happiness is contagious! Spread the joy!",)
         },
         EmotionType.SAD: {
-            'low': ["I'm here for you if you need me."],
-            'medium': ["Take your time. I'm here to support you."],
-            'high': ["I'm sorry you're feeling down. I'm here to listen anytime."]
+            'low': ("I'm here for you if you need me.",),
+            'medium': ("Take your time. I'm here to support you.",),
+            'high': ("I'm sorry you're feeling down. I'm here to listen anytime.",)
         },
         EmotionType.ANGRY: {
-            'low': ["It sounds like you’re a bit frustrated. I’m here to help."],
-            'medium': ["I'm here if you need to vent or need a break."],
-            'high': ["It sounds like you're really upset. Let's work through this together."]
+            'low': ("It sounds like you’re a bit frustrated. I’m here to help.",),
+            'medium': ("I'm here if you need to vent or need a break.",),
+            'high': ("It sounds like you're really upset. Let's work through this together.",)
         },
         EmotionType.NEUTRAL: {
-            'low': ["How can I assist you today?"],
-            'medium': ["I'm ready whenever you are!"],
-            'high': ["I'm here, ready and attentive!"]
+            'low': ("How can I assist you today?",),
+            'medium': ("I'm ready whenever you are!",),
+            'high': ("I'm here, ready and attentive!",)
         },
         # Added responses for FEARFUL
         EmotionType.FEARFUL: {
-            'low': ["It's okay to feel a bit scared. I'm here with you."],
-            'medium': ["I can sense you're worried. Let's go through this together."],
-            'high': ["I know things may seem frightening, but I'll be here for support."]
+            'low': ("It's okay to feel a bit scared. I'm here with you.",),
+            'medium': ("I can sense you're worried. Let's go through this together.",),
+            'high': ("I know things may seem frightening, but I'll be here for support.",)
         },
         # Added responses for SURPRISED
         EmotionType.SURPRISED: {
-            'low': ["Oh! It seems something unexpected happened."],
-            'medium': ["Wow, that sounds surprising!"],
-            'high': ["That's astonishing! Tell me more."]
+            'low': ("Oh! It seems something unexpected happened.",),
+            'medium': ("Wow, that sounds surprising!",),
+            'high': ("That's astonishing! Tell me more.",)
         }
     }
 
@@ -66,9 +102,21 @@ class EmotionalAnalysis:
         EmotionType.FEARFUL: ["afraid", "scared", "fearful", "worried", "anxious"],
         EmotionType.SURPRISED: ["surprised", "shocked", "amazed", "astonished", "startled"],
     }
+    # Built once at class creation instead of compiling a regex per keyword on every call
+    _keyword_automaton = _build_keyword_automaton(emotion_keywords)
+    # Fallback: keyword -> (priority, emotion), intersected with the input's word tokens
+    _keyword_index = {
+        keyword: (priority, emotion)
+        for priority, (emotion, keywords) in enumerate(emotion_keywords.items())
+        for keyword in keywords
+    }
+
+    RESPONSE_CACHE_SIZE = 512
 
     def __init__(self):
         self.current_state = EmotionalState()
+        self._rng = random.Random()  # Private generator instead of the shared module-level one
+        self._candidate_responses = functools.lru_cache(maxsize=self.RESPONSE_CACHE_SIZE)(self._fetch_candidate_responses)
 
     def detect_emotion(self, user_input):
         """
@@ -82,45 +130,63 @@ class EmotionalAnalysis:
         """
         user_input = user_input.lower()
 
-        for emotion, keywords in self.emotion_keywords.items():
-            if any(re.search(rf"\b{keyword}\b", user_input) for keyword in keywords):
-                return emotion
-
-        return EmotionType.NEUTRAL  # Default to NEUTRAL if no keywords are matched
+        if self._keyword_automaton is not None:
+            best = None
+            last = len(user_input) - 1
+            for end, (priority, emotion, length) in self._keyword_automaton.iter(user_input):
+                start = end - length + 1
+                # Match whole words only, like the \b-anchored patterns
+                if (start > 0 and _is_word_char(user_input[start - 1])) or (end < last and _is_word_char(user_input[end + 1])):
+                    continue
+                if best is None or priority < best[0]:
+                    best = (priority, emotion)
+                    if priority == 0:
+                        break
+            return best[1] if best else EmotionType.NEUTRAL
+
+        # Tokens are whole words, so this matches the same keywords as \b-anchored patterns
+        hits = self._keyword_index.keys() & _WORD_RE.findall(user_input)
+        if not hits:
+            return EmotionType.NEUTRAL
+        return min((self._keyword_index[keyword] for keyword in hits), key=itemgetter(0))[1]
 
     def get_intensity_level(self, intensity):
-        if intensity < 0.3:
-            return 'low'
-        elif intensity < 0.7:
-            return 'medium'
-        else:
-            return 'high'
+        return _INTENSITY_LEVELS[bisect_right(_INTENSITY_THRESHOLDS, intensity)]
     
+    def estimate_intensity(self, text):
+        return 0.7 if "very" in text or "extremely" in text else 0.5  # Adjust intensity based on input
+
     def analyze_emotion(self, text):
         detected_emotion = self.detect_emotion(text)
-        intensity = 0.7 if "very" in text or "extremely" in text else 0.5  # Adjust intensity based on input
+        intensity = self.estimate_intensity(text)
         self.current_state.update_emotion(detected_emotion, intensity)
         return self.current_state
 
     def get_response(self, context=None):
         intensity_level = self.get_intensity_level(self.current_state.intensity)
-        dynamic_response = learning_module.fetch_dynamic_response(
-            emotion=self.current_state.emotion,
-            intensity=intensity_level,
-            context=context.get('activity', 'general') if context else 'general'
-        )
-
-        if dynamic_response:
-            response = dynamic_response
-        else:
-            base_responses = self.RESPONSE_MAP.get(self.current_state.emotion, {}).get(intensity_level, ["I'm here for you."])
-            response = choice(base_responses)
+        activity = context.get('activity', 'general') if context else 'general'
+        response = self._rng.choice(self._candidate_responses(self.current_state.emotion, intensity_level, activity, learning_module.response_version))
         
         if context:
             response = self.context_aware_response(response, context)
         
         return response
 
+    def _fetch_candidate_responses(self, emotion, intensity_level, activity, epoch):
+        """
+        Returns the responses to choose from for an emotion, intensity level and activity.
+        Memoized per instance; epoch is learning_module.response_version, so a response saved through
+        any instance invalidates earlier results.
+        """
+        dynamic_response = learning_module.fetch_dynamic_response(
+            emotion=emotion,
+            intensity=intensity_level,
+            context=activity
+        )
+        if dynamic_response:
+            return (dynamic_response,)
+        return self.RESPONSE_MAP.get(emotion, {}).get(intensity_level, ("I'm here for you.",))
+
     def context_aware_response(self, response, context):
         context_data = context.get('activity', None)
         if context_data == 'work_stress':
@@ -140,28 +206,28 @@ class EmotionalAnalysis:
             learning_module.save_response(self.current_state.emotion, response, feedback)
 
 # Usage example
+if __name__ == "__main__":
+    # Create EmotionalAnalysis instance
+    emotional_analysis = EmotionalAnalysis()
 
-# Create EmotionalAnalysis instance
-emotional_analysis = EmotionalAnalysis()
-
-# Placeholder context example
-context_example = {
-    'activity': 'work_stress'
-}
+    # Placeholder context example
+    context_example = {
+        'activity': 'work_stress'
+    }
 
-# Analyze and update emotion based on text
-user_input = "I feel really happy with how things are going!"
-emotional_analysis.analyze_emotion(user_input)
+    # Analyze and update emotion based on text
+    user_input = "I feel really happy with how things are going!"
+    emotional_analysis.analyze_emotion(user_input)
 
-# Generate response
-response = emotional_analysis.get_response(context=context_example)
-print("Assistant Response:", response)
+    # Generate response
+    response = emotional_analysis.get_response(context=context_example)
+    print("Assistant Response:", response)
 
-# Placeholder feedback example
-feedback_example = {
-    'user_reaction': 'positive',
-    'suggestion': None
-}
+    # Placeholder feedback example
+    feedback_example = {
+        'user_reaction': 'positive',
+        'suggestion': None
+    }
 
-# Process feedback
-emotional_analysis.receive_feedback(response, feedback_example)
\ No newline at end of file
+    # Process feedback
+    emotional_analysis.receive_feedback(response, feedback_example)
\ No newline at end of file
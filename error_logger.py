@@ -1,7 +1,70 @@
+import atexit
 import logging
+import logging.handlers
+import mmap
+import os
+import queue
+import threading
 from datetime import datetime
 
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    File handler that buffers records in a large write buffer instead of flushing after each one.
+    ERROR and CRITICAL records are flushed immediately; everything else is flushed every
+    FLUSH_INTERVAL seconds by a background thread and when logging shuts down at exit.
+    """
+    BUFFER_SIZE = 128 * 1024
+    FLUSH_INTERVAL = 30
+
+    def __init__(self, filename: str):
+        super().__init__(filename)
+        self._stopped = threading.Event()
+        threading.Thread(target=self._flush_periodically, name="ErrorLoggerFlush", daemon=True).start()
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.BUFFER_SIZE, encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.FLUSH_INTERVAL):
+            self.flush()
+
+    def close(self):
+        self._stopped.set()
+        super().close()
+
+
+# One handler per log file and one console handler, shared by every ErrorLogger instance
+_file_handlers = {}
+_console_handler = None
+_handlers_lock = threading.Lock()
+
+# Callers only enqueue records; a single listener thread formats them and runs the handlers above
+_log_queue = queue.Queue(-1)
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_listener = None  # Started with the first ErrorLogger
+
+
+@atexit.register
+def _stop_listener():
+    """Writes out every queued record and stops the listener thread."""
+    if _listener is not None:
+        _listener.stop()
+
+
 class ErrorLogger:
+    __slots__ = ("logger", "log_file")
+
     def __init__(self, log_file: str = "error_log.txt", log_level: int = logging.ERROR):
         """
         Initializes the error logger with a specified log file and log level.
@@ -12,23 +75,39 @@ class ErrorLogger:
         # Set up the logging configuration
         self.logger = logging.getLogger("MiaErrorLogger")
         self.logger.setLevel(log_level)
+        # Records are written by the handlers below only, not again by any handlers on the root logger
+        self.logger.propagate = False
 
-        # Create a file handler to write logs to a file
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(log_level)
+        self.log_file = log_file
 
-        # Create a console handler to optionally output errors to the console
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.WARNING)  # Set to WARNING to avoid excessive console logging
+        global _console_handler, _listener
+        with _handlers_lock:
+            # Create a buffered file handler to write logs to a file, reusing one already attached for it
+            file_handler = _file_handlers.get(os.path.abspath(log_file))
+            if file_handler is None:
+                file_handler = _BufferedFileHandler(log_file)
+                _file_handlers[os.path.abspath(log_file)] = file_handler
+            file_handler.setLevel(log_level)
 
-        # Set a logging format
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
+            # Create a console handler to optionally output errors to the console
+            if _console_handler is None:
+                _console_handler = logging.StreamHandler()
+                _console_handler.setLevel(logging.WARNING)  # Set to WARNING to avoid excessive console logging
 
-        # Add handlers to the logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+            # Set a logging format
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            file_handler.setFormatter(formatter)
+            _console_handler.setFormatter(formatter)
+
+            # Hand each handler to the listener once, so each record is written once however many loggers exist
+            if _listener is None:
+                _listener = logging.handlers.QueueListener(_log_queue, respect_handler_level=True)
+                _listener.start()
+            for handler in (file_handler, _console_handler):
+                if handler not in _listener.handlers:
+                    _listener.handlers += (handler,)
+            if _queue_handler not in self.logger.handlers:
+                self.logger.addHandler(_queue_handler)
 
     def log_error(self, message: str, exception: Exception = None):
         """
@@ -68,16 +147,34 @@ class ErrorLogger:
     def get_recent_logs(self, count: int = 10) -> list:
         """
         Retrieves the most recent log entries from the log file.
+        Maps the file and searches backwards for line breaks, so only the pages holding the tail are read.
         Args:
             count (int): The number of recent logs to retrieve.
         Returns:
             list: A list of recent log entries as strings.
         """
+        if count <= 0:
+            return []
+        handler = _file_handlers.get(os.path.abspath(self.log_file))
+        if handler is not None:
+            # Include records still waiting for the listener or sitting in the write buffer
+            _log_queue.join()
+            handler.flush()
         try:
-            with open("error_log.txt", "r") as file:
-                logs = file.readlines()
+            with open(self.log_file, "rb") as file:
+                if not os.fstat(file.fileno()).st_size:
+                    return []  # Empty files cannot be mapped
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    position = len(mapped)
+                    # One extra newline guarantees the first kept line is complete
+                    for _ in range(count + 1):
+                        position = mapped.rfind(b"\n", 0, position)
+                        if position < 0:
+                            position = 0
+                            break
+                    buffer = mapped[position:]
             # Get the most recent 'count' logs
-            return logs[-count:]
+            return [line.decode("utf-8", errors="replace") for line in buffer.splitlines(keepends=True)[-count:]]
         except FileNotFoundError:
             self.log_error("Log file not found.")
             return []
@@ -1,33 +1,133 @@
-import json
+import atexit
+import orjson
 import os
-from datetime import datetime
-from collections import defaultdict
+import queue
+import threading
+from collections import Counter, defaultdict
+from itertools import chain
+from utility_functions import current_timestamp
 
 # Storage file for feedback history
 FEEDBACK_FILE = "feedback_data.json"
+# Append-only log of feedback entries recorded since FEEDBACK_FILE was last consolidated
+FEEDBACK_LOG_FILE = "feedback_data.jsonl"
+_FEEDBACK_LOG_BUFFER = 65536
+_WRITE_BATCH_SIZE = 128  # Most entries written per log write
+_WRITE_INTERVAL = 0.25  # Seconds the writer waits to gather a batch
 
 # Internal storage for feedback
 _feedback_data = defaultdict(list)
+_feedback_log = None  # Append handle for FEEDBACK_LOG_FILE, opened on first entry
+_log_lock = threading.Lock()  # Serializes log writes with closing the handle
+_write_q = queue.Queue()  # Entries waiting to be appended by the writer thread
+_writer_thread = None  # Started on the first logged entry
+_feedback_loaded = False  # Whether _feedback_data holds the full history and may be consolidated
+# Running trend counters, kept in step with _feedback_data so trend analysis needs no rescan
+_reaction_counts = Counter()
+_suggestion_counts = Counter()
+# Bumped whenever the feedback history changes, so callers can tell when derived results are stale
+feedback_version = 0
 
 # --- Helper Functions ---
 
 def load_feedback():
-    """Loads previous feedback data for session continuity."""
-    global _feedback_data
+    """Loads previous feedback data for session continuity, replaying entries logged since the last save."""
+    global _feedback_data, _feedback_loaded, feedback_version
+    _close_feedback_log()  # Make sure every logged entry is on disk before replaying
+    _feedback_data = defaultdict(list)
+    _reaction_counts.clear()
+    _suggestion_counts.clear()
     if os.path.exists(FEEDBACK_FILE):
-        with open(FEEDBACK_FILE, "r") as f:
-            _feedback_data = json.load(f)
-    else:
-        _feedback_data = defaultdict(list)
+        with open(FEEDBACK_FILE, "rb") as f:
+            _feedback_data.update(orjson.loads(f.read()))
+    if os.path.exists(FEEDBACK_LOG_FILE):
+        with open(FEEDBACK_LOG_FILE, "rb") as f:
+            for line in f:
+                try:
+                    entry = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    break  # Partially written final line
+                _feedback_data[entry["emotion"]].append(entry)
+    # Rebuild the trend counters in one pass over the flattened history
+    entries = list(chain.from_iterable(_feedback_data.values()))
+    _reaction_counts.update(entry["reaction"] for entry in entries)
+    _suggestion_counts.update(entry["suggestion"] for entry in entries if entry["suggestion"])
+    _feedback_loaded = True
+    feedback_version += 1
 
 def save_feedback():
-    """Saves feedback data for future analysis and improvement."""
-    with open(FEEDBACK_FILE, "w") as f:
-        json.dump(_feedback_data, f)
+    """Consolidates all feedback into FEEDBACK_FILE and starts a fresh entry log."""
+    _close_feedback_log()
+    tmp_file = FEEDBACK_FILE + ".tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(orjson.dumps(_feedback_data))
+    os.replace(tmp_file, FEEDBACK_FILE)
+    if os.path.exists(FEEDBACK_LOG_FILE):
+        os.remove(FEEDBACK_LOG_FILE)
+
+def _append_feedback(line):
+    """Queues one serialized entry for the feedback log; the writer thread appends it off the request path."""
+    global _writer_thread
+    if _writer_thread is None:
+        _writer_thread = threading.Thread(target=_writer, name="FeedbackWriter", daemon=True)
+        _writer_thread.start()
+    _write_q.put(line)
+
+def _writer():
+    """
+    Background loop that appends queued entries to the feedback log in batches.
+    A failed write is reported and the loop carries on, so later entries and flushes are not stranded.
+    """
+    while True:
+        batch = [_write_q.get()]
+        try:
+            while len(batch) < _WRITE_BATCH_SIZE:
+                batch.append(_write_q.get(timeout=_WRITE_INTERVAL))
+        except queue.Empty:
+            pass
+        try:
+            _write_feedback(batch)
+        except Exception as e:
+            print(f"Error writing feedback log: {e}")
+        finally:
+            for _ in batch:
+                _write_q.task_done()
+
+def _write_feedback(lines):
+    """Appends serialized entries to the feedback log with one write and flushes it."""
+    global _feedback_log
+    with _log_lock:
+        if _feedback_log is None:
+            _feedback_log = open(FEEDBACK_LOG_FILE, "ab", buffering=_FEEDBACK_LOG_BUFFER)
+        _feedback_log.write(b"".join(lines))
+        _feedback_log.flush()
+
+def _count_feedback(feedback_entry):
+    """Adds one entry to the running trend counters."""
+    _reaction_counts[feedback_entry["reaction"]] += 1
+    if feedback_entry["suggestion"]:
+        _suggestion_counts[feedback_entry["suggestion"]] += 1
+
+def _close_feedback_log():
+    """Waits for queued entries to reach the log, then closes its handle."""
+    global _feedback_log
+    _write_q.join()
+    with _log_lock:
+        if _feedback_log is not None:
+            _feedback_log.close()
+            _feedback_log = None
+
+@atexit.register
+def _shutdown():
+    """Consolidates feedback on graceful exit when the full history is in memory, else just drains the log."""
+    if _feedback_loaded:
+        save_feedback()
+    else:
+        _close_feedback_log()
 
 def timestamp():
     """Returns the current timestamp for feedback entries."""
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return current_timestamp("%Y-%m-%d %H:%M:%S")
 
 
 # --- Core Feedback Functions ---
@@ -41,6 +141,7 @@ def process_feedback(emotion, response, feedback):
     - response (str): The AI response to which feedback was given.
     - feedback (dict): User feedback data (e.g., reaction, specific suggestions).
     """
+    global feedback_version
     feedback_entry = {
         "timestamp": timestamp(),
         "emotion": emotion.value,
@@ -48,7 +149,11 @@ def process_feedback(emotion, response, feedback):
         "reaction": feedback.get("user_reaction", "neutral"),
         "suggestion": feedback.get("suggestion")
     }
+    # Serialized here so unserializable feedback fails in the caller, not on the writer thread
+    line = orjson.dumps(feedback_entry, option=orjson.OPT_APPEND_NEWLINE)
     _feedback_data[emotion.value].append(feedback_entry)
+    _count_feedback(feedback_entry)
+    feedback_version += 1
 
     # Update metrics or save positive responses for future use if the reaction is positive
     if feedback_entry["reaction"] == "positive":
@@ -58,8 +163,8 @@ def process_feedback(emotion, response, feedback):
     if feedback_entry["reaction"] in ["negative", "constructive"]:
         refine_response_strategy(emotion, feedback.get("suggestion"))
 
-    # Save feedback for future reference
-    save_feedback()
+    # Log feedback for future reference on the writer thread, without rewriting the whole history
+    _append_feedback(line)
 
 
 def save_positive_response(emotion, response):
@@ -99,17 +204,11 @@ def analyze_feedback_trends():
     Returns:
     - dict: Summary of feedback trends, including frequently requested changes.
     """
-    trend_summary = {"positive": 0, "neutral": 0, "negative": 0, "common_suggestions": defaultdict(int)}
-    
-    for emotion, entries in _feedback_data.items():
-        for entry in entries:
-            trend_summary[entry["reaction"]] += 1
-            if entry["suggestion"]:
-                trend_summary["common_suggestions"][entry["suggestion"]] += 1
-    
-    # Convert common suggestions dictionary to a sorted list of tuples
-    trend_summary["common_suggestions"] = sorted(trend_summary["common_suggestions"].items(), 
-                                                 key=lambda x: x[1], reverse=True)
+    trend_summary = {"positive": 0, "neutral": 0, "negative": 0}
+    trend_summary.update(_reaction_counts)
+
+    # Common suggestions as a list of (suggestion, count) tuples, most frequent first
+    trend_summary["common_suggestions"] = _suggestion_counts.most_common()
     return trend_summary
 
 
@@ -1,15 +1,92 @@
 # knowledge_manager.py
 
 import json
+import orjson
+import os
+from itertools import islice
 from context_manager import ContextManager
 from utility_functions import load_from_json, save_to_json
-from fuzzywuzzy import process  # Assuming you have the fuzzywuzzy library installed
-from functools import lru_cache  # For caching
+from rapidfuzz import fuzz, process, utils  # C++ implementation of fuzzywuzzy's scorers
+
+# Parsed knowledge bases shared by every KnowledgeManager in the process, together with the lookup
+# indexes derived from them so both are replaced at once:
+# abspath -> ((snapshot mtime, journal mtime), knowledge_base, (topics, topics_lower, retrieval cache))
+_kb_cache = {}
+
+
+def _file_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _journal_path(path):
+    return os.path.splitext(path)[0] + ".journal"
+
+
+def _apply_update(knowledge_base, topic, subtopic, content):
+    if subtopic:
+        if topic not in knowledge_base:
+            knowledge_base[topic] = {}
+        knowledge_base[topic][subtopic] = content
+    else:
+        knowledge_base[topic] = content
+
+
+def _build_indexes(knowledge_base):
+    """
+    Returns the topic names, their lowercased forms (index-aligned) and an empty retrieval cache.
+    """
+    topics = list(knowledge_base)
+    return topics, [topic.lower() for topic in topics], {}
+
+
+def _remember(path, knowledge_base, indexes):
+    """
+    Records the current mtimes of a knowledge base's files alongside its parsed contents and indexes.
+    """
+    mtimes = (_file_mtime(path), _file_mtime(_journal_path(path)))
+    _kb_cache[os.path.abspath(path)] = (mtimes, knowledge_base, indexes)
+
+
+def _load_knowledge_base(path):
+    """
+    Returns the parsed knowledge base for path with its journal replayed on top, and its indexes,
+    reparsing only when either file's mtime has changed.
+    """
+    journal_path = _journal_path(path)
+    cached = _kb_cache.get(os.path.abspath(path))
+    if cached is not None and cached[0] == (_file_mtime(path), _file_mtime(journal_path)):
+        return cached[1], cached[2]
+    knowledge_base = load_from_json(path) or {}
+    if os.path.exists(journal_path):
+        with open(journal_path, "rb") as f:
+            for line in f:
+                try:
+                    update = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    break  # Partially written final line
+                _apply_update(knowledge_base, update["t"], update["s"], update["v"])
+    indexes = _build_indexes(knowledge_base)
+    _remember(path, knowledge_base, indexes)
+    return knowledge_base, indexes
 
 class KnowledgeManager:
+    __slots__ = ("knowledge_base", "knowledge_file_path", "journal_file_path", "_journal",
+                 "_topics", "_topics_lower", "_cache")
+
+    JOURNAL_COMPACT_RATIO = 1  # Rewrite the snapshot once the journal outgrows it by this factor
+
     def __init__(self, knowledge_file_path="knowledge_base.json"):
-        self.knowledge_base = load_from_json(knowledge_file_path) or {}
+        # The dict and its indexes are shared with other instances on the same file, and updated in place together:
+        # _topics lists topic names for fuzzy matching, _topics_lower their lowercased forms (index-aligned),
+        # and _cache maps topic -> {subtopic: result}, dropped per topic on update
+        self.knowledge_base, (self._topics, self._topics_lower, self._cache) = _load_knowledge_base(knowledge_file_path)
         self.knowledge_file_path = knowledge_file_path
+        # Updates are appended here and folded into knowledge_file_path when it grows too large
+        self.journal_file_path = _journal_path(knowledge_file_path)
+        self._journal = None  # Append handle, opened on first update
 
     # ---- 1. Hierarchical Knowledge Storage and Retrieval ----
     def get_knowledge(self, topic, subtopic=None):
@@ -34,21 +111,23 @@ class KnowledgeManager:
             content (str): The information to store.
             subtopic (str): Optional, the specific subtopic within the main topic.
         """
-        if subtopic:
-            if topic not in self.knowledge_base:
-                self.knowledge_base[topic] = {}
-            self.knowledge_base[topic][subtopic] = content
-        else:
-            self.knowledge_base[topic] = content
-        self._save_knowledge_base()
+        if topic not in self.knowledge_base:
+            self._topics.append(topic)
+            self._topics_lower.append(topic.lower())
+        self._cache.pop(topic, None)  # Invalidate cached lookups for this topic and its subtopics
+        _apply_update(self.knowledge_base, topic, subtopic, content)
+        self._journal_update(topic, subtopic, content)
 
     # ---- 3. Caching for Frequently Accessed Knowledge ----
-    @lru_cache(maxsize=100)
     def cached_get_knowledge(self, topic, subtopic=None):
         """
         Cached version of get_knowledge for frequently accessed items.
+        Entries for a topic are invalidated whenever that topic is added or updated.
         """
-        return self.get_knowledge(topic, subtopic)
+        topic_cache = self._cache.setdefault(topic, {})
+        if subtopic not in topic_cache:
+            topic_cache[subtopic] = self.get_knowledge(topic, subtopic)
+        return topic_cache[subtopic]
 
     # ---- 4. Fuzzy Matching for Enhanced Searching ----
     def fuzzy_search(self, query, threshold=80):
@@ -60,10 +139,12 @@ class KnowledgeManager:
         Returns:
             str: The most relevant topic or a default message.
         """
-        topics = list(self.knowledge_base.keys())
-        closest_match, score = process.extractOne(query, topics)
-        if score >= threshold:
-            return self.get_knowledge(closest_match)
+        # WRatio with default_process matches fuzzywuzzy's extractOne defaults (lowercase, strip punctuation);
+        # the cutoff lets RapidFuzz skip weak candidates early
+        match = process.extractOne(query, self._topics, scorer=fuzz.WRatio, processor=utils.default_process,
+                                   score_cutoff=threshold)
+        if match:
+            return self.get_knowledge(match[0])
         return "No closely matching topic found."
 
     # ---- 5. Context-Based Recommendations ----
@@ -77,8 +158,13 @@ class KnowledgeManager:
             list of str: Suggested related topics.
         """
         # Assuming context_topic has some related entries in knowledge_base, if not, adjust as needed
-        related_topics = [key for key in self.knowledge_base if context_topic.lower() in key.lower()]
-        return related_topics[:limit] if related_topics else ["No related topics found."]
+        # Scan the pre-lowercased names and stop as soon as enough topics are found
+        context_topic = context_topic.lower()
+        related_topics = list(islice(
+            (topic for topic, topic_lower in zip(self._topics, self._topics_lower) if context_topic in topic_lower),
+            limit
+        ))
+        return related_topics if related_topics else ["No related topics found."]
 
     # ---- 6. Advanced Query Parsing (Basic NLP) ----
     def query_knowledge(self, query):
@@ -89,22 +175,48 @@ class KnowledgeManager:
         Returns:
             str: The response based on the query.
         """
-        # Basic NLP tokenization and keyword detection
-        words = query.lower().split()
-        if "define" in words or "what is" in words:
-            topic = words[-1]  # Naive approach, assumes last word is the topic
-            return self.fuzzy_search(topic)
+        # Basic keyword detection on the leading phrase; the rest of the query is the topic
+        query = query.lower().strip()
+        for prefix in ("define ", "what is "):
+            if query.startswith(prefix):
+                topic = query[len(prefix):].strip().rstrip("?.")
+                return self.fuzzy_search(topic)
         return "I'm not sure how to interpret that query."
 
     # ---- Helper Methods ----
+    def _journal_update(self, topic, subtopic, content):
+        """
+        Appends one update to the journal, rewriting the snapshot once the journal outgrows it.
+        """
+        if self._journal is None:
+            self._journal = open(self.journal_file_path, "ab")
+        self._journal.write(orjson.dumps({"t": topic, "s": subtopic, "v": content}, option=orjson.OPT_APPEND_NEWLINE))
+        self._journal.flush()
+        snapshot_size = os.path.getsize(self.knowledge_file_path) if os.path.exists(self.knowledge_file_path) else 0
+        if self._journal.tell() > self.JOURNAL_COMPACT_RATIO * snapshot_size:
+            self._save_knowledge_base()
+        else:
+            # The append bumped the journal mtime; record it so other instances keep sharing this dict
+            _remember(self.knowledge_file_path, self.knowledge_base, self._indexes())
+
     def _save_knowledge_base(self):
         """
-        Saves the knowledge base to file.
+        Atomically rewrites the knowledge base file and empties the journal.
         """
-        save_to_json(self.knowledge_file_path, self.knowledge_base)
+        tmp_file = self.knowledge_file_path + ".tmp"
+        save_to_json(self.knowledge_base, tmp_file)
+        os.replace(tmp_file, self.knowledge_file_path)
+        if os.path.exists(self.journal_file_path):
+            # Truncate rather than remove, so append handles held by other instances stay valid
+            os.truncate(self.journal_file_path, 0)
+        # The writes bumped the mtimes; record them so other instances keep sharing this dict
+        _remember(self.knowledge_file_path, self.knowledge_base, self._indexes())
+
+    def _indexes(self):
+        return self._topics, self._topics_lower, self._cache
     
     def clear_cache(self):
         """
         Clears the cached knowledge retrieval.
         """
-        self.cached_get_knowledge.cache_clear()
\ No newline at end of file
+        self._cache.clear()
\ No newline at end of file
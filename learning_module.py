@@ -1,5 +1,8 @@
-import json
+import atexit
+import orjson
 import os
+import queue
+import threading
 from datetime import datetime, timedelta
 import random
 from collections import defaultdict
@@ -7,6 +10,21 @@ from collections import defaultdict
 # Placeholder for a model or other learning mechanism
 _model = None
 _feedback_data = defaultdict(list)  # Stores feedback data with emotion-based categorization
+_loaded = False  # Whether the model and feedback data have been read from disk yet
+# Bumped whenever the learned responses change, so callers caching them can tell when their results are stale
+response_version = 0
+
+# Saved responses are appended to this log in batches and folded into the JSON file by save_feedback_data
+FEEDBACK_DATA_FILE = "feedback_data.json"
+RESPONSE_LOG_FILE = "learning_feedback.jsonl"
+LOG_COMPACT_RATIO = 2  # Fold the log into the JSON file once it outgrows the file by this factor
+_FLUSH_BATCH_SIZE = 64
+_FLUSH_INTERVAL = 0.25  # Seconds the writer waits to gather a batch
+_write_q = queue.Queue()  # Log records waiting for the writer thread
+_writer_thread = None  # Started on the first saved response
+_compact_due = False  # Set by the writer once the log has grown past LOG_COMPACT_RATIO
+# Held while a response is recorded and while the log is folded into the file, so no record falls in between
+_save_lock = threading.Lock()
 
 
 # --- Core Learning Functions ---
@@ -23,6 +41,7 @@ def fetch_dynamic_response(emotion, intensity, context):
     Returns:
     - str or None: A suitable learned response if available, else None.
     """
+    _ensure_loaded()
     if _model:
         return _model.predict(emotion, intensity, context)
     else:
@@ -38,26 +57,38 @@ def save_response(emotion, response, feedback):
     - response (str): The response text given to the user.
     - feedback (dict): Feedback data associated with this response.
     """
+    global response_version
+    _ensure_loaded()
     entry = {
         "response": response,
         "feedback": feedback,
         "timestamp": datetime.now().isoformat()
     }
-    _feedback_data[emotion].append(entry)
-    if sum(len(entries) for entries in _feedback_data.values()) % 10 == 0:
+    # Keyed by the string value, matching what is loaded back from disk
+    key = getattr(emotion, "value", emotion)
+    # Serialized here so unserializable feedback fails in the caller, not on the writer thread
+    line = orjson.dumps({"emotion": key, "entry": entry}, option=orjson.OPT_APPEND_NEWLINE)
+    with _save_lock:
+        _feedback_data[key].append(entry)
+        response_version += 1
+        _enqueue(line)
+    if _compact_due:
         save_feedback_data()
 
 
 def adapt_response_patterns():
+    _ensure_loaded()
     if _feedback_data:
         positive_feedback = [entry for entries in _feedback_data.values() for entry in entries if entry["feedback"].get("rating", 0) > 3]
         print(f"Adapting response patterns based on {len(positive_feedback)} positive feedback entries.")
 
 
 def train_from_feedback():
+    _ensure_loaded()
     if _feedback_data:
         print(f"Training model with {sum(len(entries) for entries in _feedback_data.values())} feedback entries.")
         _feedback_data.clear()
+        save_feedback_data()  # Persist the clear, or the log would bring the entries back on the next load
 
 
 # --- Model Persistence Functions ---
@@ -79,29 +110,108 @@ def load_model(file_path="model.pkl"):
 
 # --- Helper Functions for Feedback Management ---
 
-def save_feedback_data(file_path="feedback_data.json"):
+def _enqueue(line):
     """
-    Saves feedback data to a JSON file, enabling persistence across sessions.
+    Hands a serialized log line to the writer thread so the caller never waits on disk I/O.
+    """
+    global _writer_thread
+    if _writer_thread is None:
+        _writer_thread = threading.Thread(target=_writer, name="LearningWriter", daemon=True)
+        _writer_thread.start()
+    _write_q.put(line)
+
+
+def _writer():
+    """
+    Background loop that appends queued lines to the response log in batches, one write per batch.
+    A failed write is reported and the loop carries on, so later records and flushes are not stranded.
     """
-    with open(file_path, 'w') as f:
-        json.dump({k: v for k, v in _feedback_data.items()}, f)
+    global _compact_due
+    while True:
+        batch = [_write_q.get()]
+        try:
+            while len(batch) < _FLUSH_BATCH_SIZE:
+                batch.append(_write_q.get(timeout=_FLUSH_INTERVAL))
+        except queue.Empty:
+            pass
+        try:
+            with open(RESPONSE_LOG_FILE, 'ab') as f:
+                f.write(b"".join(batch))
+                log_size = f.tell()
+            snapshot_size = os.path.getsize(FEEDBACK_DATA_FILE) if os.path.exists(FEEDBACK_DATA_FILE) else 0
+            _compact_due = not snapshot_size or log_size > LOG_COMPACT_RATIO * snapshot_size
+        except Exception as e:
+            print(f"Error writing response log: {e}")
+        finally:
+            for _ in batch:
+                _write_q.task_done()
+
+
+def _flush_pending():
+    """
+    Blocks until every queued record has been written to the log.
+    """
+    _write_q.join()
 
 
-def load_feedback_data(file_path="feedback_data.json"):
+def _save_at_exit():
+    """
+    Folds the response log into the JSON file at shutdown, if anything was loaded or recorded this run.
+    """
+    if _loaded:
+        save_feedback_data()
+
+
+atexit.register(_save_at_exit)
+
+
+def save_feedback_data(file_path=FEEDBACK_DATA_FILE):
+    """
+    Saves feedback data to a JSON file, enabling persistence across sessions.
+    The response log is folded into the file and truncated.
+    """
+    global _compact_due
+    with _save_lock:
+        _flush_pending()  # Queued records are part of _feedback_data and must not be replayed on top of the file
+        tmp_file = file_path + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(_feedback_data))
+        os.replace(tmp_file, file_path)
+        if os.path.exists(RESPONSE_LOG_FILE):
+            os.remove(RESPONSE_LOG_FILE)
+        _compact_due = False
+
+
+def load_feedback_data(file_path=FEEDBACK_DATA_FILE):
     """
     Loads feedback data from a JSON file, allowing the system to learn from past interactions.
     """
-    global _feedback_data
+    global _feedback_data, response_version
     if os.path.exists(file_path):
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            _feedback_data = defaultdict(list, {k: v for k, v in data.items()})
+        with open(file_path, 'rb') as f:
+            _feedback_data = defaultdict(list, orjson.loads(f.read()))
     else:
         _feedback_data = defaultdict(list)
+    # Replay responses saved since the JSON file was last written
+    if os.path.exists(RESPONSE_LOG_FILE):
+        with open(RESPONSE_LOG_FILE, 'rb') as f:
+            for line in f:
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    break  # Partially written final line
+                _feedback_data[record["emotion"]].append(record["entry"])
+    response_version += 1
 
 
 # --- Initialization ---
 
-# Load model and feedback data when module is loaded
-load_model()
-load_feedback_data()
\ No newline at end of file
+def _ensure_loaded():
+    """
+    Loads the model and feedback data on first use rather than at import time.
+    """
+    global _loaded
+    if not _loaded:
+        _loaded = True
+        load_model()
+        load_feedback_data()
\ No newline at end of file
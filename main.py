@@ -4,12 +4,27 @@ import session_manager  # Import as a module, not as a class
 import datetime
 import traceback
 
+# Greeting for each hour of the day, indexed by datetime.hour
+_GREETINGS = tuple(
+    "Good evening" if hour >= 18 else "Good afternoon" if hour >= 12 else "Good morning"
+    for hour in range(24)
+)
+
 class MainApp:
+    __slots__ = ("mia", "voice_interface", "use_voice", "voice_activated", "_commands")
+
     def __init__(self):
         self.mia = Mia()
         self.voice_interface = VoiceInterface()
         self.use_voice = False  # Start in text mode by default
         self.voice_activated = False  # Track if voice activation is triggered
+        # Lowercased command text -> handler; anything else goes to Mia
+        self._commands = {
+            'exit': self.shutdown,
+            'switch to voice': self._switch_to_voice,
+            'switch to text': self._switch_to_text,
+            'help': self.show_help,
+        }
 
     def run(self):
         """
@@ -20,32 +35,30 @@ class MainApp:
         
         while True:
             user_input = self.get_user_input()
+            command = self._commands.get(user_input.lower())
 
-            if user_input.lower() == 'exit':
-                self.shutdown()
-                break
+            if command is None:
+                response = self.process_input(user_input)
+                self.respond(response)
+                continue
 
-            elif user_input.lower() == 'switch to voice':
-                self.use_voice = True
-                self.respond("Voice mode activated. Mia will now respond with voice.")
+            command()
+            if command == self.shutdown:
+                break
 
-            elif user_input.lower() == 'switch to text':
-                self.use_voice = False
-                self.respond("Text mode activated. Mia will now respond with text.")
+    def _switch_to_voice(self):
+        self.use_voice = True
+        self.respond("Voice mode activated. Mia will now respond with voice.")
 
-            elif user_input.lower() == 'help':
-                self.show_help()
-                
-            else:
-                response = self.process_input(user_input)
-                self.respond(response)
+    def _switch_to_text(self):
+        self.use_voice = False
+        self.respond("Text mode activated. Mia will now respond with text.")
 
     def greet_user(self):
         """
         Provides a time-based greeting to the user.
         """
-        current_hour = datetime.datetime.now().hour
-        greeting = "Good evening" if current_hour >= 18 else "Good afternoon" if current_hour >= 12 else "Good morning"
+        greeting = _GREETINGS[datetime.datetime.now().hour]
         self.respond(f"{greeting}! Welcome to Mia. Type 'help' for commands or 'switch to voice' to enable voice mode.")
         
     def get_user_input(self) -> str:
@@ -1,39 +1,54 @@
 import asyncio
 from typing import Any, Dict, Tuple
 from datetime import datetime
-from command_parser import CommandParser
 from context_manager import ContextManager
 from core_logic import CoreLogic
 from task_scheduler import TaskScheduler
-from voice_interface import VoiceInterface
-from api_connector import APIConnector
 from emotional_analysis import EmotionalAnalysis
 from error_logger import ErrorLogger
-from self_optimizer import SelfOptimizer
 from data_storage import DataStorage
-from security_manager import SecurityManager
+from utility_functions import lazy_instance
 import session_manager  # Use as a module
 import feedback_processor
 
+try:
+    import uvloop  # Optional: libuv-based event loop with lower per-task overhead
+except ImportError:
+    uvloop = None
+
+# Result type -> formatter for the user-facing response
+_RESULT_FORMATS = {
+    "task": "Task Result: {}".format,           # Task-related response
+    "knowledge": "Knowledge Result: {}".format, # Knowledge response, e.g., definitions or information
+    "api": "API Response: {}".format,           # API response
+    "default": "Response: {}".format,           # General or fallback response
+}
+
 class Mia:
     def __init__(self):
-        # Initialize core components
-        self.command_parser = CommandParser()
+        # Initialize core components; subsystems a session may never touch are imported and built on first use
         self.context_manager = ContextManager()
         self.core_logic = CoreLogic()
+        self.command_parser = self.core_logic.command_parser  # Reuse the parser wired to shared modules
         self.task_scheduler = TaskScheduler()
-        self.voice_interface = VoiceInterface()
-        self.api_connector = APIConnector()
+        self.voice_interface = lazy_instance("voice_interface", "VoiceInterface")
+        self.api_connector = self.core_logic.api_connector  # One pooled HTTP session for all API calls
         self.emotional_analysis = EmotionalAnalysis()
-        self.error_logger = ErrorLogger()
-        self.self_optimizer = SelfOptimizer()
-        self.data_storage = DataStorage()
-        self.security_manager = SecurityManager()
+        self.error_logger = ErrorLogger()  # Eager: used by every error path
+        self.self_optimizer = lazy_instance("self_optimizer", "SelfOptimizer")
+        self.data_storage = DataStorage()  # Eager: the user profile is loaded below
+        self.security_manager = lazy_instance("security_manager", "SecurityManager")
 
         # Initialize state and settings
         self.active_session = None
         self.user_profile = self.data_storage.load_user_profile()
         self.voice_enabled = True  # Default to voice-enabled mode
+        # Intent -> coroutine taking the parsed data and returning (result_type, result_data)
+        self._routes = {
+            "schedule_task": self._route_schedule_task,
+            "knowledge_lookup": self._route_knowledge_lookup,
+            "api_request": self._route_api_request,
+        }
     
     def start_session(self, user_id: str):
         """
@@ -69,8 +84,8 @@ class Mia:
         Primary method for processing user input and returning a response.
         """
         try:
-            # Parse command to determine intent and route
-            parsed_data = self.command_parser.parse_command(user_input)
+            # Parse command to determine intent and route; the NLP models run off the event loop
+            parsed_data = await asyncio.to_thread(self.command_parser.parse_command, user_input)
             if not self.command_parser.validate_command(parsed_data):
                 return "I'm not sure I understand. Could you rephrase?"
             
@@ -85,51 +100,37 @@ class Mia:
         """
         Routes parsed data to the appropriate module asynchronously.
         """
-        # Dynamic routing based on parsed command intent
-        intent = parsed_data.get("intent")
-        
-        if intent == "schedule_task":
-            details = parsed_data.get("details", {})
-            result = self.task_scheduler.schedule_task(parsed_data["task_name"], parsed_data["time"], details)
-            return "task", result
+        # Dynamic routing based on parsed command intent; core logic handles anything unmatched
+        route = self._routes.get(parsed_data.get("intent"), self._route_default)
+        return await route(parsed_data)
+
+    async def _route_schedule_task(self, parsed_data: Dict) -> Tuple[str, Any]:
+        details = parsed_data.get("details", {})
+        result = self.task_scheduler.schedule_task(parsed_data["task_name"], parsed_data["time"], details)
+        return "task", result
 
-        elif intent == "knowledge_lookup":
-            knowledge_data = await self.core_logic.fetch_knowledge(parsed_data["query"])
-            return "knowledge", knowledge_data
+    async def _route_knowledge_lookup(self, parsed_data: Dict) -> Tuple[str, Any]:
+        knowledge_data = await self.core_logic.fetch_knowledge(parsed_data["query"])
+        return "knowledge", knowledge_data
 
-        elif intent == "api_request":
-            service, endpoint, params = parsed_data["service"], parsed_data["endpoint"], parsed_data["params"]
-            api_response = await self.api_connector.make_async_request(service, endpoint, params)
-            return "api", api_response
+    async def _route_api_request(self, parsed_data: Dict) -> Tuple[str, Any]:
+        service, endpoint, params = parsed_data["service"], parsed_data["endpoint"], parsed_data["params"]
+        api_response = await self.api_connector.make_async_request(service, endpoint, params)
+        return "api", api_response
 
-        else:
-            # Default to core logic if no intent matches
-            result = await self.core_logic.handle_default(parsed_data)
-            return "default", result
+    async def _route_default(self, parsed_data: Dict) -> Tuple[str, Any]:
+        result = await self.core_logic.handle_default(parsed_data)
+        return "default", result
 
     def handle_result(self, result_type: str, result_data: Any) -> str:
         """
         Processes results returned from routed modules.
         """
-        if result_type == "task":
-            # Task-related response
-            return f"Task Result: {result_data}"
-        
-        elif result_type == "knowledge":
-            # Knowledge response, e.g., definitions or information
-            return f"Knowledge Result: {result_data}"
-        
-        elif result_type == "api":
-            # API response
-            return f"API Response: {result_data}"
-        
-        elif result_type == "default":
-            # General or fallback response
-            return f"Response: {result_data}"
-        
-        else:
+        formatter = _RESULT_FORMATS.get(result_type)
+        if formatter is None:
             # Unexpected result
             return "I encountered an unexpected response type."
+        return formatter(result_data)
 
     def respond_with_voice(self, text: str):
         """
@@ -200,4 +201,4 @@ if __name__ == "__main__":
         mia.collect_feedback(response)
         mia.end_session()
 
-    asyncio.run(sample_interaction())
\ No newline at end of file
+    (uvloop.run if uvloop is not None else asyncio.run)(sample_interaction())
\ No newline at end of file
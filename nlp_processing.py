@@ -1,8 +1,16 @@
+import asyncio
+import functools
 import re
 import spacy
 from transformers import pipeline
 from utility_functions import clean_text  # Assuming clean_text from utility_functions
-from typing import List, Dict, Tuple
+from emotional_analysis import EmotionalAnalysis
+from typing import Any, Callable, List, Dict, Tuple
+
+try:
+    import ahocorasick  # Optional: matches every context keyword in one pass
+except ImportError:
+    ahocorasick = None
 
 # Load SpaCy model for parsing and NER
 nlp_spacy = spacy.load("en_core_web_sm")
@@ -10,9 +18,55 @@ nlp_spacy = spacy.load("en_core_web_sm")
 # Load Hugging Face pipeline for sentiment analysis
 sentiment_pipeline = pipeline("sentiment-analysis")
 
+# Batch sizes for running many texts through SpaCy and the sentiment model at once
+SPACY_BATCH_SIZE = 64
+SENTIMENT_BATCH_SIZE = 32
+
+# Intent keyed by the lemma that signals it, and the dependency labels whose tokens become keywords
+INTENT_LEMMAS = {
+    "define": "definition", "explain": "definition", "meaning": "definition",
+    "recommend": "recommendation", "suggest": "recommendation", "advise": "recommendation",
+    "create": "creation", "build": "creation", "make": "creation",
+}
+INTENT_PRIORITY = ("definition", "recommendation", "creation")  # Earlier intents win when several match
+_INTENT_RANK = {intent: rank for rank, intent in enumerate(INTENT_PRIORITY)}
+INTENT_KEYWORD_DEPS = {
+    "definition": {"dobj", "pobj", "attr"},
+    "recommendation": {"dobj", "pobj"},
+    "creation": {"dobj", "pobj"},
+}
+
+@functools.lru_cache(maxsize=128)
+def _keyword_matcher(keywords: frozenset) -> Callable[[str], bool]:
+    """
+    Returns a predicate telling whether a text contains any of the keywords as a substring.
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, else one compiled regex alternation.
+    Cached per keyword set, so repeated calls with the same context skip construction.
+    """
+    if not keywords:
+        return lambda text: False
+    if "" in keywords:
+        return lambda text: True  # The empty string is a substring of everything
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords))
+    return lambda text: pattern.search(text) is not None
+
+# Patterns for clean_and_normalize_text, compiled once
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s]')
+
 class NLPProcessing:
+    DOC_CACHE_SIZE = 512
+
     def __init__(self):
-        pass
+        self.emotional_analysis = EmotionalAnalysis()  # Keyword-based emotion detection
+        # Parsed Docs by exact text, so entity, intent and bundle analysis of one input share a single parse
+        self._doc = functools.lru_cache(maxsize=self.DOC_CACHE_SIZE)(nlp_spacy)
 
     # ---- 1. Tokenization and Preprocessing ----
     def tokenize_text(self, text: str) -> List[str]:
@@ -23,9 +77,21 @@ class NLPProcessing:
         Returns:
             List[str]: A list of tokens.
         """
-        doc = nlp_spacy(text.lower())
+        # Only the tokenizer is needed; is_alpha is a lexical attribute, so the tagger, parser and NER are skipped
+        doc = nlp_spacy.make_doc(text.lower())
         return [token.text for token in doc if token.is_alpha]  # Keep only alphabetic tokens
 
+    def tokenize_texts(self, texts: List[str]) -> List[List[str]]:
+        """
+        Batched form of tokenize_text: all texts go through the SpaCy tokenizer in one streamed pass.
+        Args:
+            texts (List[str]): The texts to tokenize.
+        Returns:
+            List[List[str]]: One token list per text, in input order.
+        """
+        docs = nlp_spacy.tokenizer.pipe((text.lower() for text in texts), batch_size=SPACY_BATCH_SIZE)
+        return [[token.text for token in doc if token.is_alpha] for doc in docs]
+
     # ---- 2. Advanced Sentiment Analysis ----
     def analyze_sentiment(self, text: str) -> Dict[str, float]:
         """
@@ -35,7 +101,24 @@ class NLPProcessing:
         Returns:
             Dict[str, float]: Sentiment scores including positive, negative, and neutral probability.
         """
-        sentiment_result = sentiment_pipeline(text)[0]
+        return self._sentiment_scores(sentiment_pipeline(text)[0])
+
+    def analyze_sentiments(self, texts: List[str]) -> List[Dict[str, float]]:
+        """
+        Batched form of analyze_sentiment: the transformer runs once over padded batches of texts.
+        Args:
+            texts (List[str]): The texts to analyze.
+        Returns:
+            List[Dict[str, float]]: Sentiment scores per text, in input order.
+        """
+        results = sentiment_pipeline(list(texts), batch_size=SENTIMENT_BATCH_SIZE, truncation=True)
+        return [self._sentiment_scores(result) for result in results]
+
+    @staticmethod
+    def _sentiment_scores(sentiment_result: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Converts one raw sentiment pipeline result into positive/negative/neutral scores.
+        """
         label = sentiment_result["label"].lower()
         score = sentiment_result["score"]
 
@@ -56,7 +139,7 @@ class NLPProcessing:
         Returns:
             List[Tuple[str, str]]: List of entities and their labels (e.g., PERSON, ORG, etc.).
         """
-        doc = nlp_spacy(text)
+        doc = self._doc(text)
         entities = [(ent.text, ent.label_) for ent in doc.ents]
         return entities
 
@@ -69,25 +152,63 @@ class NLPProcessing:
         Returns:
             Dict[str, str]: Parsed intent and relevant keywords or subjects.
         """
-        doc = nlp_spacy(text.lower())
-        intent = "unknown"
-        keywords = []
+        return self._intent_from_doc(self._doc(text.lower()), text)
 
-        # Detect intents based on patterns
-        if any(token.lemma_ in ["define", "explain", "meaning"] for token in doc):
-            intent = "definition"
-            keywords = [token.text for token in doc if token.dep_ in {"dobj", "pobj", "attr"}]
-        
-        elif any(token.lemma_ in ["recommend", "suggest", "advise"] for token in doc):
-            intent = "recommendation"
-            keywords = [token.text for token in doc if token.dep_ in {"dobj", "pobj"}]
-        
-        elif any(token.lemma_ in ["create", "build", "make"] for token in doc):
-            intent = "creation"
-            keywords = [token.text for token in doc if token.dep_ in {"dobj", "pobj"}]
+    def _intent_from_doc(self, doc, text: str) -> Dict[str, str]:
+        """
+        Derives intent and keywords from an already-parsed SpaCy Doc.
+        """
+        # Detect intents based on patterns, scanning the lemmas once
+        intent, rank = "unknown", len(INTENT_PRIORITY)
+        for token in doc:
+            candidate = INTENT_LEMMAS.get(token.lemma_)
+            if candidate is not None and _INTENT_RANK[candidate] < rank:
+                intent, rank = candidate, _INTENT_RANK[candidate]
+                if rank == 0:
+                    break  # Nothing outranks the first intent, so the rest of the Doc can't change it
+        keywords = []
+        if intent != "unknown":
+            deps = INTENT_KEYWORD_DEPS[intent]
+            keywords = [token.text for token in doc if token.dep_ in deps]
 
         return {"intent": intent, "keywords": keywords, "original_text": text}
 
+    # ---- 4b. Combined Analysis for a Single Turn ----
+    def analyze_bundle(self, text: str) -> Dict[str, Any]:
+        """
+        Runs intent, sentiment, and emotion analysis on one input in a single pass.
+        The SpaCy pipeline and the sentiment model are each invoked once per call.
+        Args:
+            text (str): The text to analyze.
+        Returns:
+            Dict[str, Any]: Intent, keywords, sentiment scores, detected emotion, and intensity.
+        """
+        bundle = self._intent_from_doc(self._doc(text.lower()), text)
+        bundle["sentiment"] = self.analyze_sentiment(text)
+        bundle["emotion"] = self.emotional_analysis.detect_emotion(text)
+        bundle["intensity"] = self.emotional_analysis.estimate_intensity(text)
+        return bundle
+
+    def analyze_bundle_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Batched form of analyze_bundle: SpaCy and the sentiment model each run once over all texts,
+        amortizing their fixed per-call cost.
+        Args:
+            texts (List[str]): The texts to analyze.
+        Returns:
+            List[Dict[str, Any]]: One analysis bundle per text, in input order.
+        """
+        docs = nlp_spacy.pipe([text.lower() for text in texts], batch_size=SPACY_BATCH_SIZE)
+        sentiments = self.analyze_sentiments(texts)
+        bundles = []
+        for text, doc, sentiment in zip(texts, docs, sentiments):
+            bundle = self._intent_from_doc(doc, text)
+            bundle["sentiment"] = sentiment
+            bundle["emotion"] = self.emotional_analysis.detect_emotion(text)
+            bundle["intensity"] = self.emotional_analysis.estimate_intensity(text)
+            bundles.append(bundle)
+        return bundles
+
     # ---- 5. Contextual Entity Extraction for Knowledge Lookups ----
     def extract_contextual_entities(self, text: str, context_keywords: List[str]) -> List[Tuple[str, str]]:
         """
@@ -99,7 +220,8 @@ class NLPProcessing:
             List[Tuple[str, str]]: List of relevant entities based on the context.
         """
         entities = self.extract_entities(text)
-        relevant_entities = [ent for ent in entities if any(kw in ent[0].lower() for kw in context_keywords)]
+        matches = _keyword_matcher(frozenset(context_keywords))
+        relevant_entities = [ent for ent in entities if matches(ent[0].lower())]
         return relevant_entities
 
     # ---- 6. Enhanced Text Cleanup ----
@@ -112,10 +234,61 @@ class NLPProcessing:
             str: Cleaned and normalized text.
         """
         text = text.lower()
-        text = re.sub(r'\s+', ' ', text)  # Remove extra whitespace
-        text = re.sub(r'[^\w\s]', '', text)  # Remove special characters
+        text = _WHITESPACE_RE.sub(' ', text)  # Remove extra whitespace
+        text = _SPECIAL_CHARS_RE.sub('', text)  # Remove special characters
         return text
 
+class NLUBatcher:
+    """
+    Collects concurrent analysis requests for a short window and runs them through
+    NLPProcessing.analyze_bundle_batch together, resolving each caller's future with its own result.
+    """
+
+    def __init__(self, nlp: NLPProcessing, max_batch: int = 16, window: float = 0.02):
+        self.nlp = nlp
+        self.max_batch = max_batch
+        self.window = window  # Seconds to wait for more requests after the first one arrives
+        self._queue = None  # asyncio.Queue of (text, future), created inside the running loop
+        self._worker = None
+
+    async def analyze(self, text: str) -> Dict[str, Any]:
+        """
+        Queues a text for the next batch and waits for its analysis bundle.
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._drain())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                # Run the models off the event loop so new requests keep queueing meanwhile
+                results = await asyncio.to_thread(self.nlp.analyze_bundle_batch, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
 # Test cases to validate enhanced functionality
 if __name__ == "__main__":
     nlp = NLPProcessing()
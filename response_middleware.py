@@ -1,40 +1,89 @@
 # response_middleware.py
-import json
+import atexit
+import orjson
+import os
+import threading
+
+FALLBACK_RESPONSE = "I'm not sure how to respond. Could you teach me?"
 
 class ResponseMiddleware:
+    FLUSH_INTERVAL = 5  # Seconds between writes of learned responses
+
     def __init__(self, knowledge_file="knowledge.json"):
         self.knowledge_file = knowledge_file
         self.knowledge = self.load_knowledge()
+        # Updates only bump the change count; a background thread writes the knowledge at most once per interval
+        self._changes = 0
+        self._saved_changes = 0  # Change count covered by the last successful write
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        threading.Thread(target=self._flush_periodically, name="ResponseMiddlewareFlush", daemon=True).start()
+        atexit.register(self.close)
 
     def load_knowledge(self):
+        """
+        Loads learned responses as {user_input: {"response": ..., "strength": N}}.
+        Entries saved as a bare response by older versions are upgraded to that shape.
+        """
         try:
-            with open(self.knowledge_file, 'r') as f:
-                return json.load(f)
-        except (IOError, json.JSONDecodeError):
+            with open(self.knowledge_file, 'rb') as f:
+                knowledge = orjson.loads(f.read())
+        except (IOError, orjson.JSONDecodeError):
             return {}
+        for user_input, entry in knowledge.items():
+            if not isinstance(entry, dict):
+                knowledge[user_input] = {"response": entry, "strength": 1}
+        return knowledge
 
     def save_knowledge(self):
-        with open(self.knowledge_file, 'w') as f:
-            json.dump(self.knowledge, f, ensure_ascii=False, indent=4)
+        """
+        Atomically rewrites the knowledge file from memory.
+        """
+        with self._lock:
+            changes = self._changes  # Read first, so updates made during the write are picked up by the next flush
+            snapshot = dict(self.knowledge)  # Copied in one step so concurrent updates can't break serialization
+            tmp_file = self.knowledge_file + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(snapshot, option=orjson.OPT_NON_STR_KEYS))
+            os.replace(tmp_file, self.knowledge_file)
+            self._saved_changes = changes
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.FLUSH_INTERVAL):
+            try:
+                self.flush()
+            except (IOError, TypeError) as e:
+                # Changes stay pending and are retried on the next interval
+                print(f"Error saving learned responses: {e}")
+
+    def flush(self):
+        """
+        Writes the knowledge file if anything changed since the last write.
+        """
+        if self._changes != self._saved_changes:
+            self.save_knowledge()
+
+    def close(self):
+        """
+        Stops the background writer and writes any pending changes.
+        """
+        self._stopped.set()
+        self.flush()
 
     def get_fallback_response(self, user_input):
-        if user_input in self.knowledge:
-            return self.knowledge[user_input]
-        else:
-            return "I'm not sure how to respond. Could you teach me?"
+        entry = self.knowledge.get(user_input)
+        return FALLBACK_RESPONSE if entry is None else entry.get("response")
 
     def learn_response(self, user_input, user_feedback):
         # Store user feedback as a response to this input
-        self.knowledge[user_input] = user_feedback
-        self.save_knowledge()
+        self.knowledge[user_input] = {"response": user_feedback, "strength": 1}
+        self._changes += 1
 
     def process_feedback(self, user_input, feedback):
         if feedback.get("user_reaction") == "positive":
-            # Reinforce the response for similar future queries
-            if user_input in self.knowledge:
-                self.knowledge[user_input]["strength"] += 1
-            else:
-                self.learn_response(user_input, feedback.get("suggestion"))
-            self.save_knowledge()
+            # Reinforce the response for similar future queries, learning it first if it's new
+            entry = self.knowledge.setdefault(user_input, {"response": feedback.get("suggestion"), "strength": 0})
+            entry["strength"] = entry.get("strength", 0) + 1
+            self._changes += 1
 
 response_middleware = ResponseMiddleware()
\ No newline at end of file
@@ -1,5 +1,8 @@
+import asyncio
+import heapq
+import inspect
+import itertools
 import time
-import threading
 from datetime import datetime, timedelta
 from typing import Callable, Dict, Any
 from task_scheduler import TaskScheduler
@@ -7,9 +10,16 @@ from error_logger import ErrorLogger
 from feedback_processor import FeedbackProcessor
 from self_optimizer import SelfOptimizer
 from data_storage import DataStorage
+from utility_functions import current_timestamp
 
 class Scheduler:
-    """Handles scheduling, periodic checks, and execution of tasks in the background."""
+    """
+    Handles scheduling, periodic checks, and execution of tasks in the background.
+    Runs as a task on the caller's asyncio event loop once start() has been awaited.
+    """
+
+    POLL_INTERVAL = 60  # Longest sleep, for tasks added to the TaskScheduler directly
+    OVERDUE_MARGIN = 0.01  # Seconds past a one-time task's run time before it counts as overdue
 
     def __init__(self, task_scheduler: TaskScheduler, error_logger: ErrorLogger, feedback_processor: FeedbackProcessor, self_optimizer: SelfOptimizer):
         self.task_scheduler = task_scheduler
@@ -18,35 +28,73 @@ class Scheduler:
         self.self_optimizer = self_optimizer
         self.data_storage = DataStorage()
         
-        # Dictionary to manage periodic tasks and their intervals
+        # Dictionary to manage periodic tasks and their intervals; times are float seconds, converted only for display
         self.periodic_tasks: Dict[str, Dict[str, Any]] = {}
-        self._scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
-        self._scheduler_thread.start()
-
-    def _run_scheduler(self):
-        """Continuously checks and executes scheduled tasks."""
+        # Min-heap of (monotonic due time, sequence, periodic task name or None for a one-time task wakeup)
+        self._heap = []
+        self._sequence = itertools.count()  # Tie-breaker so names are never compared
+        self._wakeup = None  # asyncio.Event set when a new entry may be due sooner; created by start()
+        self._task = None
+
+    async def start(self):
+        """Starts the scheduler loop as a task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run_scheduler_async())
+
+    def _delay_until_next_fire(self) -> float:
+        if not self._heap:
+            return self.POLL_INTERVAL
+        return min(max(self._heap[0][0] - time.monotonic(), 0), self.POLL_INTERVAL)
+
+    async def _run_scheduler_async(self):
+        """Sleeps until the earliest scheduled entry is due, then executes every task that is due."""
         while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._delay_until_next_fire())
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
             try:
                 # Check and execute any overdue tasks
                 overdue_tasks = self.task_scheduler.check_overdue_tasks()
                 for task_name in overdue_tasks:
-                    self.execute_task(task_name)
-                    
-                # Execute periodic tasks based on their defined intervals
-                for task_name, task_info in self.periodic_tasks.items():
-                    last_run = task_info.get("last_run")
-                    interval = task_info.get("interval")
-                    if datetime.now() >= last_run + interval:
-                        self.execute_task(task_name, periodic=True)
-                        self.periodic_tasks[task_name]["last_run"] = datetime.now()
-                
-                time.sleep(60)  # Wait before checking tasks again
+                    await self.execute_task(task_name)
+
+                # Execute periodic tasks whose next run has come
+                now = time.monotonic()
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap))
+                for next_run, _, task_name in due:
+                    task_info = self.periodic_tasks.get(task_name)
+                    # Entries for canceled or re-added tasks are stale and skipped
+                    if task_info is None or task_info["next_run"] != next_run:
+                        continue
+                    await self.execute_task(task_name, periodic=True)
+                    task_info["last_run"] = time.time()
+                    self._push(task_name, task_info, time.monotonic() + task_info["interval_s"])
             except Exception as e:
                 self.error_logger.log_error("Scheduler Error", e)
 
+    def _push(self, task_name, task_info, next_run: float):
+        """Queues the next run of a periodic task and wakes the scheduler loop to re-arm its sleep."""
+        task_info["next_run"] = next_run
+        heapq.heappush(self._heap, (next_run, next(self._sequence), task_name))
+        self._wake()
+
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
     def schedule_task(self, task_name: str, run_time: datetime, details: Dict[str, Any] = None):
         """Schedules a one-time task."""
-        return self.task_scheduler.schedule_task(task_name, run_time, details)
+        result = self.task_scheduler.schedule_task(task_name, run_time, details)
+        # Wake up just after the run time, when check_overdue_tasks will report the task
+        due = time.monotonic() + max((run_time - datetime.now()).total_seconds(), 0) + self.OVERDUE_MARGIN
+        heapq.heappush(self._heap, (due, next(self._sequence), None))
+        self._wake()
+        return result
 
     def add_periodic_task(self, task_name: str, interval: timedelta, task_func: Callable, details: Dict[str, Any] = None):
         """
@@ -54,19 +102,23 @@ class Scheduler:
         Args:
             task_name (str): Name of the periodic task.
             interval (timedelta): How often to run the task.
-            task_func (Callable): The function to call each interval.
+            task_func (Callable): The function or coroutine function to call each interval.
             details (dict): Additional task details.
         """
-        self.periodic_tasks[task_name] = {
+        task_info = {
             "task_func": task_func,
             "interval": interval,
-            "last_run": datetime.now(),
+            "interval_s": interval.total_seconds(),
+            "last_run": time.time(),
             "details": details or {}
         }
+        self.periodic_tasks[task_name] = task_info
+        self._push(task_name, task_info, time.monotonic() + task_info["interval_s"])
 
-    def execute_task(self, task_name: str, periodic: bool = False):
+    async def execute_task(self, task_name: str, periodic: bool = False):
         """
-        Executes a scheduled or periodic task.
+        Executes a scheduled or periodic task. Coroutine task functions are awaited on the loop;
+        plain functions run in a worker thread so they cannot stall other tasks.
         Args:
             task_name (str): Name of the task to execute.
             periodic (bool): Flag to indicate if the task is periodic.
@@ -74,7 +126,12 @@ class Scheduler:
         try:
             if periodic:
                 task_func = self.periodic_tasks[task_name].get("task_func")
-                task_func()
+                if inspect.iscoroutinefunction(task_func):
+                    result = task_func()
+                else:
+                    result = await asyncio.to_thread(task_func)
+                if inspect.isawaitable(result):  # e.g. a lambda returning a coroutine
+                    await result
             else:
                 result = self.task_scheduler.run_task(task_name)
                 print(result)
@@ -89,7 +146,7 @@ class Scheduler:
         """Logs task execution details."""
         log_data = {
             "task_name": task_name,
-            "execution_time": datetime.now().isoformat(),
+            "execution_time": current_timestamp(),
             "periodic": periodic
         }
         self.data_storage.store_task_log(log_data)
@@ -127,8 +184,8 @@ class Scheduler:
         periodic_tasks = [
             {
                 "task_name": name,
-                "interval": task["interval"].total_seconds(),
-                "last_run": task["last_run"].isoformat()
+                "interval": task["interval_s"],
+                "last_run": datetime.fromtimestamp(task["last_run"]).isoformat()
             }
             for name, task in self.periodic_tasks.items()
         ]
@@ -136,21 +193,25 @@ class Scheduler:
     
 # Example Usage
 if __name__ == "__main__":
-    scheduler = Scheduler(TaskScheduler(), ErrorLogger(), FeedbackProcessor(), SelfOptimizer(FeedbackProcessor(), LearningModule()))
-
-    # Schedule a one-time task
-    print(scheduler.schedule_task("Backup", datetime.now() + timedelta(minutes=5), {"priority": "high"}))
-
-    # Start a self-optimization cycle every 6 hours
-    scheduler.start_self_optimization_cycle(interval=timedelta(hours=6))
+    async def main():
+        scheduler = Scheduler(TaskScheduler(), ErrorLogger(), FeedbackProcessor(), SelfOptimizer(FeedbackProcessor(), LearningModule()))
+        await scheduler.start()
+
+        # Schedule a one-time task
+        print(scheduler.schedule_task("Backup", datetime.now() + timedelta(minutes=5), {"priority": "high"}))
+
+        # Start a self-optimization cycle every 6 hours
+        scheduler.start_self_optimization_cycle(interval=timedelta(hours=6))
+
+        # Add a periodic task
+        scheduler.add_periodic_task(
+            "data_backup",
+            interval=timedelta(hours=1),
+            task_func=lambda: print("Running data backup task."),
+            details={"priority": "medium"}
+        )
 
-    # Add a periodic task
-    scheduler.add_periodic_task(
-        "data_backup",
-        interval=timedelta(hours=1),
-        task_func=lambda: print("Running data backup task."),
-        details={"priority": "medium"}
-    )
+        # List all tasks
+        print("All tasks:", scheduler.list_tasks())
 
-    # List all tasks
-    print("All tasks:", scheduler.list_tasks())
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -1,13 +1,23 @@
+import asyncio
 import hashlib
 import hmac
 import os
+import secrets
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+# scrypt cost parameters for password hashes (n: CPU/memory cost, r: block size, p: parallelism)
+SCRYPT_PARAMS = {"n": 2 ** 14, "r": 8, "p": 1, "dklen": 32}
 
 class SecurityManager:
     def __init__(self):
         # Store allowed users and access levels in a dictionary for quick lookup
         self.user_data = {}  # Structure: {username: {"password_hash": ..., "access_level": ...}}
         self.active_sessions = {}  # Tracks user sessions, e.g., {username: session_token}
+        self.session_owners = {}  # Reverse index of active_sessions: {session_token: username}
+        # Worker threads for bulk verification; scrypt releases the GIL, so hashes run in parallel across cores
+        self._pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="SecurityManagerVerify")
 
     # ---- 1. Add User ----
     def add_user(self, username: str, password: str, access_level: str) -> str:
@@ -30,13 +40,27 @@ class SecurityManager:
             return False
         return self.check_password(password, user_info["password_hash"])
 
+    # ---- 2b. Verify Users in Bulk ----
+    async def verify_users_bulk(self, creds: List[Tuple[str, str]]) -> List[bool]:
+        """
+        Verifies many (username, password) pairs concurrently, returning one result per pair in order.
+        """
+        loop = asyncio.get_running_loop()
+        return list(await asyncio.gather(
+            *(loop.run_in_executor(self._pool, self.verify_user, username, password) for username, password in creds)
+        ))
+
     # ---- 3. Create Session ----
     def create_session(self, username: str) -> str:
         """
         Creates a session for a verified user.
         """
         session_token = self.generate_token()
+        previous_token = self.active_sessions.get(username)
+        if previous_token is not None:
+            self.session_owners.pop(previous_token, None)
         self.active_sessions[username] = session_token
+        self.session_owners[session_token] = username
         return session_token
 
     # ---- 4. Check Session ----
@@ -46,13 +70,21 @@ class SecurityManager:
         """
         return self.active_sessions.get(username) == session_token
 
+    # ---- 4b. Verify Session ----
+    def verify_session(self, session_token: str) -> bool:
+        """
+        Checks that a session token belongs to an active session, without re-hashing any password.
+        Intended for per-request checks once a user has logged in with verify_user.
+        """
+        return session_token is not None and session_token in self.session_owners
+
     # ---- 5. Hash Password ----
     def hash_password(self, password: str) -> str:
         """
-        Hashes a password with a unique salt.
+        Hashes a password with a unique salt using scrypt.
         """
         salt = os.urandom(16)
-        password_hash = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, 100000)
+        password_hash = hashlib.scrypt(password.encode(), salt=salt, **SCRYPT_PARAMS)
         return salt.hex() + password_hash.hex()
 
     # ---- 6. Check Password ----
@@ -62,7 +94,7 @@ class SecurityManager:
         """
         salt = bytes.fromhex(hashed[:32])
         original_hash = hashed[32:]
-        check_hash = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, 100000).hex()
+        check_hash = hashlib.scrypt(password.encode(), salt=salt, **SCRYPT_PARAMS).hex()
         return hmac.compare_digest(check_hash, original_hash)
 
     # ---- 7. Generate Token ----
@@ -70,7 +102,7 @@ class SecurityManager:
         """
         Generates a secure session token.
         """
-        return hashlib.sha256(os.urandom(32)).hexdigest()
+        return secrets.token_hex(32)
 
     # ---- 8. Encrypt Data ----
     def encrypt_data(self, data: str, key: str) -> str:
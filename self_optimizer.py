@@ -1,3 +1,5 @@
+import logging
+from collections import Counter
 from learning_module import (
     fetch_dynamic_response,
     save_response,
@@ -8,20 +10,47 @@ from learning_module import (
 )
 import feedback_processor as feedback  # Use feedback_module directly for feedback processing functions
 
+logger = logging.getLogger(__name__)
+
 class SelfOptimizer:
+    __slots__ = ("threshold", "importance_threshold", "min_data_size", "_sat_mu", "_sat_var", "_fb_version", "_fb_cache")
+
+    BASE_THRESHOLD = 5  # Issue threshold when satisfaction sits at target
+    BASE_IMPORTANCE_THRESHOLD = 10  # Task importance threshold when satisfaction sits at target
+    MIN_THRESHOLD = 3
+    MIN_IMPORTANCE_THRESHOLD = 5
+    SATISFACTION_TARGET = 0.85
+    SATISFACTION_ALPHA = 0.1  # Weight of the newest satisfaction sample in the running mean/variance
+    FEEDBACK_VOLUME_REFERENCE = 100  # Feedback volume above which thresholds scale down proportionally
+
     def __init__(self):
-        self.threshold = 5  # Initial threshold for common issues
-        self.importance_threshold = 10  # Initial frequency threshold for task importance
+        self.threshold = self.BASE_THRESHOLD  # Initial threshold for common issues
+        self.importance_threshold = self.BASE_IMPORTANCE_THRESHOLD  # Initial frequency threshold for task importance
+        # Exponentially weighted running mean and variance of user satisfaction
+        self._sat_mu = None
+        self._sat_var = 0.0
         self.min_data_size = 20  # Minimum data size required for training
+        # Last feedback trend summary and the feedback_version it was computed for
+        self._fb_version = -1
+        self._fb_cache = None
         feedback.load_feedback()  # Load feedback on initialization
 
+    def _feedback_trends(self):
+        """
+        Returns the feedback trend summary, recomputing it only after new feedback has arrived.
+        """
+        if feedback.feedback_version != self._fb_version:
+            self._fb_cache = feedback.analyze_feedback_trends()
+            self._fb_version = feedback.feedback_version
+        return self._fb_cache
+
     def analyze_feedback_trends(self):
         """
         Analyzes feedback data to identify areas where Mia can improve.
         Returns:
             dict: Key insights and suggested improvements.
         """
-        feedback_data = feedback.analyze_feedback_trends()
+        feedback_data = self._feedback_trends()
         
         # Process insights (e.g., common issues, sentiment trends)
         feedback_insights = {
@@ -36,10 +65,9 @@ class SelfOptimizer:
         Args:
             feedback_data (dict): Insights on user satisfaction, common issues, etc.
         """
-        # Analyze feedback data for prioritized adjustments
-        for issue, count in feedback_data.get('common_issues', {}).items():
-            if count > self.threshold:  # Threshold for significant issues
-                adapt_response_patterns()
+        # Adapt once if any issue is significant; adapt_response_patterns takes no per-issue input
+        if any(count > self.threshold for count in feedback_data.get('common_issues', {}).values()):
+            adapt_response_patterns()
 
     def refine_task_execution(self, task_name: str):
         """
@@ -60,7 +88,7 @@ class SelfOptimizer:
         """
         # Validate interaction data format before training
         if not interaction_data or len(interaction_data) < self.min_data_size:
-            print("Insufficient interaction data for training.")
+            logger.info("Insufficient interaction data for training.")
             return
         
         # Pass valid data to the learning module for training
@@ -72,33 +100,43 @@ class SelfOptimizer:
         Returns:
             dict: Evaluation summary with performance scores.
         """
+        user_satisfaction = self.calculate_satisfaction()
         evaluation_report = {
             'response_accuracy': self.calculate_accuracy(),
-            'user_satisfaction': self.calculate_satisfaction(),
+            'user_satisfaction': user_satisfaction,
             'task_efficiency': self.calculate_efficiency()
         }
         
-        # Adjust thresholds based on evaluation results
-        self.adjust_thresholds()
+        # Adjust thresholds based on evaluation results, reusing the satisfaction just computed
+        self.adjust_thresholds(satisfaction=user_satisfaction)
         
         return evaluation_report
 
-    def adjust_thresholds(self):
+    def adjust_thresholds(self, satisfaction=None, volume=None):
         """
         Adjusts feedback and task thresholds based on recent trends.
+        Args:
+            satisfaction (float, optional): Precomputed user satisfaction; calculated if omitted.
+            volume (int, optional): Precomputed feedback volume; taken from the trend summary if omitted.
         """
         # Example of analyzing feedback volume and satisfaction trends
-        feedback_volume = len(feedback.analyze_feedback_trends())
-        user_satisfaction = self.calculate_satisfaction()
-        
-        # Decrease thresholds if user satisfaction is below target or feedback volume is high
-        if user_satisfaction < 0.8 or feedback_volume > 100:  # Adjust based on actual usage
-            self.threshold = max(3, self.threshold - 1)
-            self.importance_threshold = max(5, self.importance_threshold - 2)
-        # Increase thresholds if satisfaction is high and feedback volume is low
-        elif user_satisfaction > 0.9 and feedback_volume < 50:
-            self.threshold += 1
-            self.importance_threshold += 2
+        feedback_volume = len(self._feedback_trends()) if volume is None else volume
+        user_satisfaction = self.calculate_satisfaction() if satisfaction is None else satisfaction
+
+        # Update the running satisfaction statistics
+        if self._sat_mu is None:
+            self._sat_mu = user_satisfaction
+        else:
+            delta = user_satisfaction - self._sat_mu
+            self._sat_mu += self.SATISFACTION_ALPHA * delta
+            self._sat_var = (1 - self.SATISFACTION_ALPHA) * (self._sat_var + self.SATISFACTION_ALPHA * delta * delta)
+
+        # Scale thresholds by a conservative satisfaction estimate (mean less one standard deviation)
+        # relative to target, and down further when feedback volume is high
+        scale = (self._sat_mu - self._sat_var ** 0.5) / self.SATISFACTION_TARGET
+        scale *= min(1.0, self.FEEDBACK_VOLUME_REFERENCE / max(feedback_volume, 1))
+        self.threshold = max(self.MIN_THRESHOLD, round(self.BASE_THRESHOLD * scale))
+        self.importance_threshold = max(self.MIN_IMPORTANCE_THRESHOLD, round(self.BASE_IMPORTANCE_THRESHOLD * scale))
 
     # Helper functions
     def normalize_feedback(self, feedback_data):
@@ -108,25 +146,17 @@ class SelfOptimizer:
 
     def identify_common_issues(self, feedback_data):
         """Identifies common issues from feedback data."""
-        common_issues = {}
-        for feedback in feedback_data:
-            issue = feedback.get('issue')
-            if issue:
-                common_issues[issue] = common_issues.get(issue, 0) + 1
-        return common_issues
+        issues = (feedback.get('issue') for feedback in feedback_data)
+        return Counter(issue for issue in issues if issue)
 
     def evaluate_sentiment(self, feedback_data):
         """Analyzes sentiment trends within feedback data."""
-        sentiment_trends = {'positive': 0, 'neutral': 0, 'negative': 0}
-        for feedback in feedback_data:
-            sentiment = feedback.get('sentiment')
-            if sentiment in sentiment_trends:
-                sentiment_trends[sentiment] += 1
-        return sentiment_trends
+        counts = Counter(feedback.get('sentiment') for feedback in feedback_data)
+        return {sentiment: counts[sentiment] for sentiment in ('positive', 'neutral', 'negative')}
 
     def adjust_response(self, issue):
         """Adjusts response patterns based on the identified issue."""
-        print(f"Adjusting response for issue: {issue}")
+        logger.debug("Adjusting response for issue: %s", issue)
 
     def get_task_data(self, task_name):
         """Retrieves task-specific data needed for performance adjustments."""
@@ -134,7 +164,7 @@ class SelfOptimizer:
 
     def adjust_execution_parameters(self, task_name, task_data):
         """Adjusts execution parameters based on task data."""
-        print(f"Optimizing task execution for: {task_name}")
+        logger.debug("Optimizing task execution for: %s", task_name)
 
     def calculate_accuracy(self):
         """Calculates response accuracy."""
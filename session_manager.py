@@ -1,24 +1,54 @@
+import copy
+import logging
+import os
+from collections import deque, namedtuple
 from datetime import datetime
-from utility_functions import save_to_json, load_from_json, format_datetime
+from itertools import islice
+import orjson
+try:
+    import pyarrow as pa  # Optional: columnar export of session feedback for bulk analytics
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+from utility_functions import load_from_json, format_datetime
 from context_manager import ContextManager
 from learning_module import fetch_dynamic_response, save_response, adapt_response_patterns
 from feedback_processor import process_feedback
 from emotional_analysis import EmotionalAnalysis
 
+logger = logging.getLogger(__name__)
+
 # Initialize necessary components
 emotional_analysis = EmotionalAnalysis()
 context_manager = ContextManager()  # Create an instance of ContextManager
 
-# Path for saving session data
-SESSION_DATA_PATH = "session_data.json"
+# Path for saving session data: one JSON object per line, appended at the end of each session
+SESSION_DATA_PATH = "session_data.jsonl"
+# Pre-JSONL session archive (a single JSON array), still read when no JSONL log exists yet
+LEGACY_SESSION_DATA_PATH = "session_data.json"
+# Block size used when scanning backwards from the end of the session log
+TAIL_READ_BLOCK = 4096
+# Columnar copy of every session's feedback, one row per feedback entry
+FEEDBACK_PARQUET_PATH = "session_feedback.parquet"
+# Columns exported per feedback entry
+FEEDBACK_COLUMNS = ("rating", "issue", "sentiment")
+# Most recent interactions kept for the current session; older ones are dropped
+MAX_INTERACTIONS = 500
+
+# One logged exchange; a tuple is smaller than a dict and is only converted when the session is saved
+Interaction = namedtuple("Interaction", "timestamp user_input response emotion context_version")
 
 # In-memory session storage for ongoing session
 _current_session = {
     "start_time": None,
     "end_time": None,
-    "interactions": [],
-    "feedback": []
+    "interactions": deque(maxlen=MAX_INTERACTIONS),
+    "feedback": [],
+    "contexts": {}  # Context version -> snapshot, recorded once per distinct context
 }
+# Running total and count of ratings in the current session's feedback, so averages need no rescan
+_rating_sum = 0.0
+_rating_count = 0
 
 # --- Session Management Functions ---
 
@@ -26,13 +56,16 @@ def start_session():
     """
     Starts a new session, setting the start time and initializing interaction and feedback storage.
     """
-    global _current_session
+    global _current_session, _rating_sum, _rating_count
     _current_session.update({
         "start_time": datetime.now().isoformat(),
-        "interactions": [],
-        "feedback": []
+        "interactions": deque(maxlen=MAX_INTERACTIONS),
+        "feedback": [],
+        "contexts": {}
     })
-    print(f"Session started at {_current_session['start_time']}")
+    _rating_sum = 0.0
+    _rating_count = 0
+    logger.debug("Session started at %s", _current_session["start_time"])
 
 
 def end_session():
@@ -41,30 +74,94 @@ def end_session():
     """
     global _current_session
     _current_session["end_time"] = datetime.now().isoformat()
-    save_session_data(_current_session)
-    print(f"Session ended at {_current_session['end_time']}")
+    save_session_data({
+        **_current_session,
+        "interactions": [interaction._asdict() for interaction in _current_session["interactions"]]
+    })
+    logger.debug("Session ended at %s", _current_session["end_time"])
 
 
 def save_session_data(session_data, file_path=None):
     """
-    Saves the given session data to a JSON file. If the file already contains session data, appends to it.
+    Appends the given session data as a single line to the JSONL session log, without rereading earlier sessions.
     """
     file_path = file_path or SESSION_DATA_PATH
     try:
-        all_sessions = load_from_json(file_path) or []
-    except (IOError, ValueError) as e:
-        print(f"Error loading sessions: {e}")
-        all_sessions = []
-    
-    if not isinstance(all_sessions, list):
-        all_sessions = [all_sessions]
-    
-    all_sessions.append(session_data)
-    
-    try:
-        save_to_json(all_sessions, file_path)
-    except IOError as e:
-        print(f"Error saving session data: {e}")
+        with open(file_path, "ab") as f:
+            f.write(orjson.dumps(session_data, default=str, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS))
+    except (IOError, TypeError) as e:
+        logger.error("Error saving session data: %s", e)
+
+
+def _read_last_line(file_path):
+    """
+    Returns the last non-empty line of a file, reading backwards from the end in fixed-size blocks.
+    """
+    with open(file_path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        buf = b""
+        pos = end
+        while pos > 0:
+            step = min(TAIL_READ_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            stripped = buf.rstrip(b"\n")
+            if b"\n" in stripped:
+                return stripped.rsplit(b"\n", 1)[1]
+        return buf.rstrip(b"\n")
+
+
+def _load_last_session():
+    """
+    Returns the most recently saved session from the JSONL log, or from the legacy JSON archive if no log exists.
+    """
+    if os.path.exists(SESSION_DATA_PATH):
+        line = _read_last_line(SESSION_DATA_PATH)
+        return orjson.loads(line) if line else None
+    all_sessions = load_from_json(LEGACY_SESSION_DATA_PATH) or []
+    if isinstance(all_sessions, list):
+        return all_sessions[-1] if all_sessions else None
+    return all_sessions
+
+
+def export_feedback_parquet(file_path=None, sessions_path=None):
+    """
+    Flattens the feedback of every logged session into a Parquet table, so analytics can scan
+    ratings and issues as columns instead of walking nested session dicts. Requires pyarrow.
+    """
+    if pa is None:
+        raise ImportError("The 'pyarrow' package is required to export session feedback.")
+    columns = {"session_start": []}
+    columns.update((name, []) for name in FEEDBACK_COLUMNS)
+    with open(sessions_path or SESSION_DATA_PATH, "rb") as f:
+        for line in f:
+            try:
+                session = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                break
+            for entry in session.get("feedback", ()):
+                columns["session_start"].append(session.get("start_time"))
+                for name in FEEDBACK_COLUMNS:
+                    columns[name].append(entry.get(name))
+    pq.write_table(pa.table(columns), file_path or FEEDBACK_PARQUET_PATH)
+
+
+def load_feedback_columns(columns=FEEDBACK_COLUMNS, file_path=None):
+    """
+    Reads only the requested columns of the exported feedback table. Requires pyarrow.
+    """
+    if pq is None:
+        raise ImportError("The 'pyarrow' package is required to read session feedback.")
+    return pq.read_table(file_path or FEEDBACK_PARQUET_PATH, columns=list(columns))
+
+
+def count_feedback_issues(file_path=None):
+    """
+    Counts how often each issue appears across all exported session feedback.
+    """
+    counts = load_feedback_columns(("issue",), file_path).column("issue").drop_null().value_counts()
+    return {item["values"].as_py(): item["counts"].as_py() for item in counts}
 
 
 # --- Interaction Tracking Functions ---
@@ -72,23 +169,24 @@ def save_session_data(session_data, file_path=None):
 def log_interaction(user_input, response, emotion=None):
     """
     Logs a single interaction, capturing the user input, system response, and emotion if provided.
-    """
-    interaction = {
-        "timestamp": datetime.now().isoformat(),
-        "user_input": user_input,
-        "response": response,
-        "emotion": emotion,
-        "context": context_manager.get_context()  # Use context_manager instance here
-    }
+    The context is stored by version; its snapshot is copied into the session's contexts only the first time it is seen.
+    """
+    context, version = context_manager.get_context_view()
+    contexts = _current_session["contexts"]
+    if version not in contexts:
+        # Deep snapshot of the read-only view: nested values such as preferences and temporary_state change in place
+        contexts[version] = copy.deepcopy(dict(context))
+    interaction = Interaction(datetime.now().isoformat(timespec='seconds'), user_input, response, emotion, version)
     _current_session["interactions"].append(interaction)
-    print(f"Logged interaction: {interaction}")
+    logger.debug("Logged interaction: %s", interaction)
 
 
 def get_recent_interactions(n=5):
     """
     Retrieves the most recent interactions, up to the number specified.
     """
-    return _current_session["interactions"][-n:]
+    interactions = _current_session["interactions"]
+    return list(islice(interactions, max(0, len(interactions) - n), None))
 
 
 # --- Feedback Management Functions ---
@@ -97,21 +195,21 @@ def add_feedback(feedback_entry):
     """
     Adds feedback to the current session, processes it, and adapts response patterns.
     """
+    global _rating_sum, _rating_count
     _current_session["feedback"].append(feedback_entry)
+    if 'rating' in feedback_entry:
+        _rating_sum += feedback_entry['rating']
+        _rating_count += 1
     process_feedback(feedback_entry)
     adapt_response_patterns()
 
 
 def get_cumulative_feedback():
     """
-    Computes the average rating and feedback count from the current session's feedback.
+    Returns the average rating and rated-feedback count for the current session, kept up to date by add_feedback.
     """
-    if not _current_session["feedback"]:
-        return {"average_rating": 0.0, "count": 0}
-    
-    ratings = [f.get('rating') for f in _current_session["feedback"] if 'rating' in f]
-    avg_rating = sum(ratings) / len(ratings) if ratings else 0.0
-    return {"average_rating": avg_rating, "count": len(ratings)}
+    avg_rating = _rating_sum / _rating_count if _rating_count else 0.0
+    return {"average_rating": avg_rating, "count": _rating_count}
 
 
 # --- Learning and Context Integration ---
@@ -134,16 +232,15 @@ def continue_from_previous_session():
     Attempts to continue from the last session by loading the context of the previous session.
     """
     try:
-        all_sessions = load_from_json(SESSION_DATA_PATH) or []
+        last_session = _load_last_session()
     except (IOError, ValueError) as e:
-        print(f"Error loading previous sessions: {e}")
+        logger.error("Error loading previous sessions: %s", e)
         return
     
-    if all_sessions:
-        last_session = all_sessions[-1]
+    if last_session:
         if "context" in last_session:
             context_manager.update_context(last_session["context"])  # Update using context_manager instance
-            print(f"Continuing from previous session with context: {last_session['context']}")
+            logger.debug("Continuing from previous session with context: %s", last_session["context"])
 
 
 def is_active_session():
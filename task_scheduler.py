@@ -1,3 +1,4 @@
+import heapq
 from datetime import datetime, timedelta
 
 # Placeholder imports for context management, feedback, and learning modules
@@ -7,9 +8,12 @@ import learning_module
 
 class TaskScheduler:
     """Manages scheduling, executing, and tracking tasks."""
+    __slots__ = ("tasks", "_pq")
 
     def __init__(self):
         self.tasks = {}  # Dictionary to hold tasks with task_name as key and details as value
+        # Min-heap of (run_time, task_name); entries for canceled or rescheduled tasks are skipped when popped
+        self._pq = []
     
     def schedule_task(self, task_name: str, run_time: datetime, details: dict = None) -> str:
         """
@@ -20,7 +24,8 @@ class TaskScheduler:
             "details": details or {},
             "status": "scheduled"
         }
-        return f"Task '{task_name}' scheduled for {run_time.strftime('%Y-%m-%d %H:%M:%S')}."
+        heapq.heappush(self._pq, (run_time, task_name))
+        return f"Task '{task_name}' scheduled for {run_time.isoformat(sep=' ', timespec='seconds')}."
 
     def run_task(self, task_name: str) -> str:
         """
@@ -39,8 +44,11 @@ class TaskScheduler:
         """
         current_time = datetime.now()
         overdue_tasks = []
-        for name, task in self.tasks.items():
-            if task["status"] == "scheduled" and task["run_time"] < current_time:
+        # Only tasks whose run time has passed are popped; the rest of the heap is never touched
+        while self._pq and self._pq[0][0] < current_time:
+            run_time, name = heapq.heappop(self._pq)
+            task = self.tasks.get(name)
+            if task is not None and task["status"] == "scheduled" and task["run_time"] == run_time:
                 overdue_tasks.append(name)
                 task["status"] = "overdue"
         return overdue_tasks
@@ -61,7 +69,7 @@ class TaskScheduler:
         return [
             {
                 "task_name": name,
-                "run_time": task["run_time"].strftime('%Y-%m-%d %H:%M:%S'),
+                "run_time": task["run_time"].isoformat(sep=' ', timespec='seconds'),
                 "status": task["status"],
                 "details": task["details"]
             }
@@ -69,19 +77,20 @@ class TaskScheduler:
         ]
 
 # Example usage
-scheduler = TaskScheduler()
+if __name__ == "__main__":
+    scheduler = TaskScheduler()
 
-# Schedule a task
-print(scheduler.schedule_task("Backup Data", datetime.now() + timedelta(hours=1), {"priority": "high"}))
+    # Schedule a task
+    print(scheduler.schedule_task("Backup Data", datetime.now() + timedelta(hours=1), {"priority": "high"}))
 
-# List scheduled tasks
-print("Scheduled tasks:", scheduler.list_scheduled_tasks())
+    # List scheduled tasks
+    print("Scheduled tasks:", scheduler.list_scheduled_tasks())
 
-# Check for overdue tasks
-print("Overdue tasks:", scheduler.check_overdue_tasks())
+    # Check for overdue tasks
+    print("Overdue tasks:", scheduler.check_overdue_tasks())
 
-# Run a task
-print(scheduler.run_task("Backup Data"))
+    # Run a task
+    print(scheduler.run_task("Backup Data"))
 
-# Cancel a task
-print(scheduler.cancel_task("Backup Data"))
\ No newline at end of file
+    # Cancel a task
+    print(scheduler.cancel_task("Backup Data"))
\ No newline at end of file
@@ -1,7 +1,12 @@
 from datetime import datetime, timedelta
+import importlib
 import re
-import json
-import os
+import time
+import orjson
+try:
+    import re2  # Optional: linear-time matching for long transcripts
+except ImportError:
+    re2 = None
 
 
 # --- Date and Time Utilities ---
@@ -33,8 +38,34 @@ def time_until(future_time):
     return future_time - datetime.now()
 
 
+# Format (None for ISO) -> (second, formatted text) of the last timestamp, reused within the same second
+_timestamp_cache = {}
+
+
+def current_timestamp(fmt=None):
+    """
+    Returns the current local time, formatting the date and time at most once per second per format.
+
+    Args:
+    - fmt (str): Optional strftime format, giving whole-second timestamps.
+
+    Returns:
+    - str: The formatted time, or with no format the same text as datetime.now().isoformat(), microseconds included.
+    """
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    cached = _timestamp_cache.get(fmt)
+    if cached is None or cached[0] != sec:
+        text = datetime.fromtimestamp(sec).isoformat() if fmt is None else time.strftime(fmt, time.localtime(sec))
+        cached = _timestamp_cache[fmt] = (sec, text)
+    return cached[1] if fmt is not None else f"{cached[1]}.{ns // 1000:06d}"
+
+
 # --- String Utilities ---
 
+# Everything clean_text drops; only plain spaces survive as whitespace
+_CLEAN_RE = (re2 or re).compile(r'[^A-Za-z0-9 ]+')
+
+
 def clean_text(text):
     """
     Cleans a string by removing special characters and extra whitespace.
@@ -45,7 +76,8 @@ def clean_text(text):
     Returns:
     - str: Cleaned text.
     """
-    return re.sub(r'\s+', ' ', re.sub(r'[^A-Za-z0-9 ]+', '', text)).strip()
+    # str.split() collapses the remaining runs of spaces and trims the ends without a second regex pass
+    return ' '.join(_CLEAN_RE.sub('', text).split())
 
 
 def truncate_text(text, length=100):
@@ -88,8 +120,8 @@ def save_to_json(data, file_path):
     - data (dict or list): Data to save.
     - file_path (str): Path to the JSON file.
     """
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=4)
+    with open(file_path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
 
 
 def load_from_json(file_path):
@@ -102,10 +134,55 @@ def load_from_json(file_path):
     Returns:
     - dict or list: Loaded data.
     """
-    if os.path.exists(file_path):
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    return {}
+    try:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return {}
+
+
+# --- Object Utilities ---
+
+class LazyProxy:
+    """
+    Defers constructing an object until one of its attributes is first accessed.
+
+    Args:
+    - factory (callable): Zero-argument callable that builds the real object.
+    """
+    __slots__ = ("_factory", "_instance")
+
+    def __init__(self, factory):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+
+    def _resolve(self):
+        instance = object.__getattribute__(self, "_instance")
+        if instance is None:
+            instance = object.__getattribute__(self, "_factory")()
+            object.__setattr__(self, "_instance", instance)
+        return instance
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+
+def lazy_instance(module_name, class_name):
+    """
+    Returns a LazyProxy that imports a module and instantiates one of its classes on first use,
+    so neither the import nor the construction is paid for until the object is needed.
+
+    Args:
+    - module_name (str): Module to import, e.g. "voice_interface".
+    - class_name (str): Class in that module to instantiate with no arguments.
+
+    Returns:
+    - LazyProxy: Proxy for the instance.
+    """
+    return LazyProxy(lambda: getattr(importlib.import_module(module_name), class_name)())
 
 
 # --- Context Utilities ---
@@ -1,30 +1,346 @@
+import functools
+import glob
+import hashlib
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import cv2  # OpenCV for computer vision tasks
 import numpy as np
+import orjson
+
+# TensorFlow reads these at import: grow GPU memory on demand instead of reserving it all up front,
+# keep cuDNN algorithm autotuning on, and use oneDNN kernels on CPU. Values set by the user win.
+os.environ.setdefault('TF_FORCE_GPU_ALLOW_GROWTH', 'true')
+os.environ.setdefault('TF_CUDNN_USE_AUTOTUNE', '1')
+os.environ.setdefault('TF_ENABLE_ONEDNN_OPTS', '1')
+import tensorflow as tf
+from cachetools import LRUCache
 from error_logger import ErrorLogger
-from tensorflow.keras.models import load_model  # Example for a deep learning model
+from tensorflow.keras.models import load_model, Model  # Example for a deep learning model
 from tensorflow.keras.applications import ResNet50  # Pre-trained model
-from tensorflow.keras.applications.resnet50 import preprocess_input, decode_predictions
+from tensorflow.keras.applications.resnet50 import preprocess_input
+try:
+    import tensorrt as trt  # Optional: fused FP16 inference engine for the ResNet50 forward pass
+    import pycuda.autoinit  # Creates the CUDA context on import
+    import pycuda.driver as cuda
+except ImportError:
+    trt = cuda = None
+try:
+    import onnxruntime as ort  # Optional: low-overhead CUDA/CPU inference when TensorRT isn't available
+except ImportError:
+    ort = None
+
+MODEL_INPUT_SHAPE = (1, 224, 224, 3)
+ONNX_MODEL_PATH = "resnet50.onnx"
+TRT_ENGINE_PATH = "resnet50_fp16.trt"
+INT8_ENGINE_PATH = "resnet50_int8.trt"
+CALIBRATION_IMAGE_DIR = "calibration_images"  # Sample frames used to calibrate the INT8 engine, if present
+CALIBRATION_CACHE_PATH = "resnet50_int8.calib"
+CALIBRATION_MAX_IMAGES = 500
+# ResNet50 ("caffe") preprocessing: subtracting this from a channel-reversed image matches preprocess_input
+_IMAGENET_BGR_MEAN = np.array([103.939, 116.779, 123.68], dtype=np.float32)
+TOP_K_PREDICTIONS = 5
+PIPELINE_DEPTH = 2  # Frames preprocessed ahead of the one being inferred in recognize_objects_stream
+# Stand-ins for the preprocessed image in recognize_objects_stream: result already cached / preprocessing failed
+_CACHED = object()
+_FAILED = object()
+IMAGENET_CLASS_INDEX_URL = "https://storage.googleapis.com/download.tensorflow.org/data/imagenet_class_index.json"
+# Downscale factor -> imread flag that decodes straight to that resolution (JPEG decodes at reduced DCT size)
+_IMREAD_REDUCED_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+FACE_DETECTOR_MODEL_PATH = "face_detection_yunet_2023mar.onnx"
+FACE_SCORE_THRESHOLD = 0.9
+FACE_MIN_SIZE = 30  # Smallest face, in pixels, the Haar cascade searches for
+FACE_MIN_SIZE_RATIO = 0.05  # On tall frames, faces smaller than this fraction of the height are skipped
+HAAR_FACE_CASCADE_PATH = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+FACE_TILE_MIN_HEIGHT = 480  # Frames taller than this (or portrait frames) are searched in horizontal stripes
+FACE_TILES_PER_CORE = 3
+FACE_TILE_OVERLAP_RATIO = 0.2  # Stripe overlap as a fraction of frame height; larger faces get a whole-frame pass
+FACE_NMS_THRESHOLD = 0.3
+
+
+@functools.lru_cache(maxsize=None)
+def _imagenet_classes() -> tuple:
+    """
+    Returns (wnid, description) for each ImageNet class index, fetched once through Keras' file cache.
+    """
+    path = tf.keras.utils.get_file(
+        'imagenet_class_index.json', IMAGENET_CLASS_INDEX_URL,
+        cache_subdir='models', file_hash='c2c37ea517e94d9795004a39431a14cb'
+    )
+    with open(path, 'rb') as f:
+        class_index = orjson.loads(f.read())
+    return tuple(tuple(class_index[str(i)]) for i in range(len(class_index)))
+
+
+def _export_onnx(model, onnx_path: str):
+    """
+    Exports ResNet50 to ONNX with the avg_pool feature vector as a second output next to the predictions.
+    """
+    import tf2onnx
+
+    dual_output = Model(inputs=model.input, outputs=[model.output, model.get_layer('avg_pool').output])
+    signature = (tf.TensorSpec(MODEL_INPUT_SHAPE, tf.float32, name="input"),)
+    tf2onnx.convert.from_keras(dual_output, input_signature=signature, output_path=onnx_path)
+
+
+if trt is not None:
+    class _EntropyCalibrator(trt.IInt8EntropyCalibrator2):
+        """
+        Feeds preprocessed sample images to TensorRT's INT8 calibration one at a time,
+        caching the resulting scales so later engine builds can skip calibration.
+        """
+
+        def __init__(self, batches, cache_path: str = CALIBRATION_CACHE_PATH):
+            trt.IInt8EntropyCalibrator2.__init__(self)
+            self._batches = iter(batches)
+            self.cache_path = cache_path
+            self._device = cuda.mem_alloc(int(np.prod(MODEL_INPUT_SHAPE)) * np.dtype(np.float32).itemsize)
+
+        def get_batch_size(self):
+            return MODEL_INPUT_SHAPE[0]
+
+        def get_batch(self, names):
+            batch = next(self._batches, None)
+            if batch is None:
+                return None
+            cuda.memcpy_htod(self._device, np.ascontiguousarray(batch, dtype=np.float32))
+            return [int(self._device)]
+
+        def read_calibration_cache(self):
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path, 'rb') as f:
+                    return f.read()
+            return None
+
+        def write_calibration_cache(self, cache):
+            with open(self.cache_path, 'wb') as f:
+                f.write(cache)
+
+
+class _TensorRTResNet:
+    """
+    Runs ResNet50 through a TensorRT engine that returns both class predictions and the
+    avg_pool feature vector in one pass. The engine is built from the Keras model on first use
+    and serialized to disk, so later runs only deserialize it. An INT8 engine is preferred when
+    one exists or calibration images are available; otherwise the FP16 engine is used.
+    """
+
+    def __init__(self, model, preprocess, onnx_path: str = ONNX_MODEL_PATH):
+        logger = trt.Logger(trt.Logger.WARNING)
+        engine_path = self._ensure_engine(model, preprocess, logger, onnx_path)
+        with open(engine_path, 'rb') as f, trt.Runtime(logger) as runtime:
+            self.engine = runtime.deserialize_cuda_engine(f.read())
+        self.context = self.engine.create_execution_context()
+        self.stream = cuda.Stream()
+
+        # Page-locked host buffers and device buffers allocated once per binding, in binding order
+        self.bindings = []
+        self.inputs = []
+        self.outputs = []
+        for index in range(self.engine.num_bindings):
+            shape = tuple(self.engine.get_binding_shape(index))
+            host = cuda.pagelocked_empty(shape, trt.nptype(self.engine.get_binding_dtype(index)))
+            device = cuda.mem_alloc(host.nbytes)
+            self.bindings.append(int(device))
+            (self.inputs if self.engine.binding_is_input(index) else self.outputs).append((host, device))
+
+    @classmethod
+    def _ensure_engine(cls, model, preprocess, logger, onnx_path: str) -> str:
+        """
+        Returns the path of the best engine available, building it first if needed: INT8 > FP16.
+        """
+        if os.path.exists(INT8_ENGINE_PATH):
+            return INT8_ENGINE_PATH
+        calibration_files = sorted(glob.glob(os.path.join(CALIBRATION_IMAGE_DIR, '*')))[:CALIBRATION_MAX_IMAGES]
+        if calibration_files and trt.Builder(logger).platform_has_fast_int8:
+            frames = (preprocess(image) for image in map(cv2.imread, calibration_files) if image is not None)
+            calibrator = _EntropyCalibrator(frame for frame in frames if frame is not None)
+            cls._build_engine(model, logger, INT8_ENGINE_PATH, onnx_path, calibrator)
+            return INT8_ENGINE_PATH
+        if not os.path.exists(TRT_ENGINE_PATH):
+            cls._build_engine(model, logger, TRT_ENGINE_PATH, onnx_path)
+        return TRT_ENGINE_PATH
+
+    @staticmethod
+    def _build_engine(model, logger, engine_path: str, onnx_path: str, calibrator=None):
+        """
+        Exports ResNet50 with an extra avg_pool output to ONNX and builds a TensorRT engine from it:
+        FP16, plus INT8 for layers that support it when a calibrator is given. Network outputs stay FP32.
+        """
+        _export_onnx(model, onnx_path)
+
+        builder = trt.Builder(logger)
+        network = builder.create_network(1 << int(trt.NetworkDefinitionCreationFlag.EXPLICIT_BATCH))
+        parser = trt.OnnxParser(network, logger)
+        with open(onnx_path, 'rb') as f:
+            if not parser.parse(f.read()):
+                raise RuntimeError(f"Failed to parse {onnx_path}: {parser.get_error(0)}")
+        config = builder.create_builder_config()
+        if builder.platform_has_fast_fp16:
+            config.set_flag(trt.BuilderFlag.FP16)
+        if calibrator is not None:
+            config.set_flag(trt.BuilderFlag.INT8)
+            config.int8_calibrator = calibrator
+        serialized = builder.build_serialized_network(network, config)
+        if serialized is None:
+            raise RuntimeError("TensorRT engine build failed")
+        with open(engine_path, 'wb') as f:
+            f.write(serialized)
+
+    def infer(self, batch: np.ndarray) -> tuple:
+        """
+        Runs one forward pass.
+        Returns:
+            tuple: (predictions, features) as freshly copied arrays.
+        """
+        host_in, device_in = self.inputs[0]
+        np.copyto(host_in, batch)
+        cuda.memcpy_htod_async(device_in, host_in, self.stream)
+        self.context.execute_async_v2(bindings=self.bindings, stream_handle=self.stream.handle)
+        for host_out, device_out in self.outputs:
+            cuda.memcpy_dtoh_async(host_out, device_out, self.stream)
+        self.stream.synchronize()
+        predictions, features = (host_out.copy() for host_out, _ in self.outputs)
+        return predictions, features
+
+
+class _OnnxRuntimeResNet:
+    """
+    Runs the dual-output ResNet50 ONNX export through ONNX Runtime, on the CUDA execution provider
+    when it is available and on the CPU provider otherwise.
+    """
+
+    def __init__(self, model, onnx_path: str = ONNX_MODEL_PATH):
+        if not os.path.exists(onnx_path):
+            _export_onnx(model, onnx_path)
+        available = ort.get_available_providers()
+        providers = [p for p in ('CUDAExecutionProvider', 'CPUExecutionProvider') if p in available]
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(onnx_path, options, providers=providers)
+        self.input_name = self.session.get_inputs()[0].name
+
+    def infer(self, batch: np.ndarray) -> tuple:
+        """
+        Runs one forward pass.
+        Returns:
+            tuple: (predictions, features).
+        """
+        predictions, features = self.session.run(None, {self.input_name: batch.astype(np.float32, copy=False)})
+        return predictions, features
+
 
 class VisionModule:
     """
     Advanced Vision Module for image processing, object recognition, classification, and feature extraction.
     """
+    INFERENCE_CACHE_SIZE = 128  # Recent (kind, image) results reused instead of rerunning the network
 
     def __init__(self):
         self.error_logger = ErrorLogger()
-        self.model = ResNet50(weights='imagenet')  # Load pre-trained model for classification
-        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-    
-    def load_image(self, file_path: str) -> np.ndarray:
+        # Let OpenCV use its SIMD kernels and spread parallel_for_ stripes across every core
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(os.cpu_count() or 1)
+        # On GPUs, build the model under mixed_float16 so convolutions run on tensor cores, and let XLA fuse it;
+        # the policy is restored afterwards so it only applies to this model's layers
+        use_gpu = bool(tf.config.list_physical_devices('GPU'))
+        previous_policy = tf.keras.mixed_precision.global_policy()
+        if use_gpu:
+            tf.keras.mixed_precision.set_global_policy('mixed_float16')
+        # Preprocessing produces contiguous NHWC batches, so the model must be built channels-last
+        # (also the layout tensor-core convolutions prefer) whatever the user's keras.json says
+        previous_data_format = tf.keras.backend.image_data_format()
+        tf.keras.backend.set_image_data_format('channels_last')
+        try:
+            self.model = ResNet50(weights='imagenet')  # Load pre-trained model for classification
+        finally:
+            tf.keras.mixed_precision.set_global_policy(previous_policy)
+            tf.keras.backend.set_image_data_format(previous_data_format)
+        if use_gpu:
+            self.model.compile(jit_compile=True)
+        # Feature extractor over the layer just before the classifier, built and traced once
+        self.feature_extractor = Model(inputs=self.model.input, outputs=self.model.get_layer('avg_pool').output)
+        self._extract_features = tf.function(
+            lambda batch: self.feature_extractor(batch, training=False),
+            input_signature=[tf.TensorSpec(MODEL_INPUT_SHAPE, tf.float32)],
+            jit_compile=use_gpu
+        )
+        self.face_cascade = cv2.CascadeClassifier(HAAR_FACE_CASCADE_PATH)
+        # Workers for striped detection, and the per-thread cascades every detection uses, since detect_faces
+        # also runs on analyze()'s pool; a classifier isn't safe to share across threads
+        self._face_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+        self._thread_cascades = threading.local()
+        # Per-thread uint8 buffers that frames are resized into before normalization
+        self._resize_scratch = threading.local()
+        # Runs the CPU-bound OpenCV steps of analyze() while the model handles recognition
+        self._analysis_pool = ThreadPoolExecutor(max_workers=2)
+        # YuNet DNN face detector, used in place of the Haar cascade when OpenCV and the model file allow it;
+        # like the cascades, each thread gets its own instance, created from this (backend, target) pair
+        self._face_net_backend = None
+        if hasattr(cv2, 'FaceDetectorYN') and os.path.exists(FACE_DETECTOR_MODEL_PATH):
+            if hasattr(cv2, 'cuda') and cv2.cuda.getCudaEnabledDeviceCount() > 0:
+                self._face_net_backend = (cv2.dnn.DNN_BACKEND_CUDA, cv2.dnn.DNN_TARGET_CUDA_FP16)
+            else:
+                self._face_net_backend = (cv2.dnn.DNN_BACKEND_DEFAULT, cv2.dnn.DNN_TARGET_CPU)
+        self._thread_face_nets = threading.local()
+        # (kind, shape, dtype, content digest) -> recognize_objects / extract_features result
+        self._inference_cache = LRUCache(maxsize=self.INFERENCE_CACHE_SIZE)
+        # Inference engine used in place of self.model when available: TensorRT, then ONNX Runtime;
+        # Keras remains the fallback
+        self.runtime_model = None
+        if trt is not None:
+            try:
+                self.runtime_model = _TensorRTResNet(self.model, self.preprocess_image_for_model)
+            except Exception as e:
+                self.error_logger.log_warning(f"TensorRT unavailable: {e}")
+        if self.runtime_model is None and ort is not None:
+            try:
+                self.runtime_model = _OnnxRuntimeResNet(self.model)
+            except Exception as e:
+                self.error_logger.log_warning(f"ONNX Runtime unavailable: {e}")
+        self._warm_up()
+
+    def _warm_up(self):
+        """
+        Runs one dummy forward pass through each inference path, so cuDNN autotuning and XLA compilation
+        happen at startup rather than on the first user request.
+        """
+        dummy = np.zeros(MODEL_INPUT_SHAPE, dtype=np.float32)
+        try:
+            if self.runtime_model is not None:
+                self.runtime_model.infer(dummy)
+            else:
+                self.model.predict(dummy)
+                self._extract_features(dummy)
+        except Exception as e:
+            self.error_logger.log_warning(f"Model warm-up failed: {e}")
+
+    @staticmethod
+    def _image_key(kind: str, image: np.ndarray) -> tuple:
+        """
+        Builds a cache key from an image's shape, dtype and a hash of its pixels.
+        """
+        digest = hashlib.blake2b(np.ascontiguousarray(image), digest_size=16).digest()
+        return kind, image.shape, image.dtype.str, digest
+
+    def load_image(self, file_path: str, reduce: int = 1) -> np.ndarray:
         """
         Loads an image from a specified file path.
         Args:
             file_path (str): Path to the image file.
+            reduce (int): Downscale factor applied while decoding (1, 2, 4 or 8). Images only fed to the
+                224x224 model can be decoded at a fraction of their size instead of resized afterwards.
         Returns:
             np.ndarray: Loaded image as an array.
         """
         try:
-            image = cv2.imread(file_path)
+            image = cv2.imread(file_path, _IMREAD_REDUCED_FLAGS[reduce])
             if image is None:
                 raise ValueError("Image not found or unsupported format.")
             return image
@@ -32,39 +348,121 @@ class VisionModule:
             self.error_logger.log(f"Failed to load image: {e}")
             return None
 
-    def preprocess_image_for_model(self, image: np.ndarray, target_size: tuple = (224, 224)) -> np.ndarray:
+    def preprocess_image_for_model(self, image: np.ndarray, target_size: tuple = (224, 224), out: np.ndarray = None) -> np.ndarray:
         """
         Preprocesses an image for model input (e.g., resizing, normalization).
         Args:
             image (np.ndarray): Image array.
             target_size (tuple): Target size for resizing.
+            out (np.ndarray, optional): (1, height, width, 3) float32 array to write into, such as one row of a batch.
         Returns:
-            np.ndarray: Preprocessed image.
+            np.ndarray: Preprocessed image (out, if given).
         """
         try:
+            if image.dtype == np.uint8 and image.ndim == 3 and image.shape[2] == 3:
+                # Resize into this thread's scratch buffer; it is fully consumed before returning
+                shape = (target_size[1], target_size[0], 3)
+                scratch = getattr(self._resize_scratch, "buffer", None)
+                if scratch is None or scratch.shape != shape:
+                    scratch = self._resize_scratch.buffer = np.empty(shape, dtype=np.uint8)
+                resized_image = cv2.resize(image, target_size, dst=scratch)
+                if out is None:
+                    out = np.empty((1, target_size[1], target_size[0], 3), dtype=np.float32)
+                # Channel swap, float cast and mean subtraction fused into one pass, written straight into out
+                np.subtract(resized_image[..., ::-1], _IMAGENET_BGR_MEAN, out=out[0])
+                return out
             resized_image = cv2.resize(image, target_size)
-            image_array = np.expand_dims(resized_image, axis=0)
-            return preprocess_input(image_array)
+            image_array = preprocess_input(np.expand_dims(resized_image, axis=0))
+            if out is not None:
+                out[...] = image_array
+                return out
+            return image_array
         except Exception as e:
             self.error_logger.log(f"Failed to preprocess image for model: {e}")
             return None
 
     def detect_faces(self, image: np.ndarray) -> list:
         """
-        Detects faces in an image using Haar cascades.
+        Detects faces in an image using the YuNet DNN detector, or Haar cascades if it isn't available.
         Args:
             image (np.ndarray): Image array.
         Returns:
             list: List of bounding boxes for detected faces.
         """
         try:
+            if self._face_net_backend is not None:
+                face_net = self._thread_face_net()
+                height, width = image.shape[:2]
+                face_net.setInputSize((width, height))
+                _, faces = face_net.detect(image)
+                if faces is None:
+                    return []
+                return [{"x": int(x), "y": int(y), "width": int(w), "height": int(h)} for x, y, w, h in faces[:, :4]]
+
             gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            faces = self.face_cascade.detectMultiScale(gray_image, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
+            # Scaling the minimum face size with the frame drops the smallest, least useful pyramid levels
+            min_size = max(FACE_MIN_SIZE, int(gray_image.shape[0] * FACE_MIN_SIZE_RATIO))
+            height, width = gray_image.shape
+            if height > width or height > FACE_TILE_MIN_HEIGHT:
+                faces = self._detect_faces_tiled(gray_image, min_size)
+            else:
+                faces = self._thread_cascade().detectMultiScale(gray_image, scaleFactor=1.1, minNeighbors=5, minSize=(min_size, min_size))
             return [{"x": x, "y": y, "width": w, "height": h} for (x, y, w, h) in faces]
         except Exception as e:
             self.error_logger.log(f"Failed to detect faces: {e}")
             return []
 
+    def _thread_cascade(self):
+        """Returns the calling thread's own Haar cascade, loading it on first use."""
+        cascade = getattr(self._thread_cascades, "cascade", None)
+        if cascade is None:
+            cascade = self._thread_cascades.cascade = cv2.CascadeClassifier(HAAR_FACE_CASCADE_PATH)
+        return cascade
+
+    def _thread_face_net(self):
+        """Returns the calling thread's own YuNet detector, creating it on first use."""
+        face_net = getattr(self._thread_face_nets, "face_net", None)
+        if face_net is None:
+            backend, target = self._face_net_backend
+            face_net = self._thread_face_nets.face_net = cv2.FaceDetectorYN.create(
+                FACE_DETECTOR_MODEL_PATH, "", (320, 320), FACE_SCORE_THRESHOLD, backend_id=backend, target_id=target
+            )
+        return face_net
+
+    def _detect_faces_tiled(self, gray_image: np.ndarray, min_size: int) -> list:
+        """
+        Runs the Haar cascade over overlapping horizontal stripes in parallel, so tall frames don't
+        leave most cores idle behind OpenCV's width-based work split. Stripes search faces up to the
+        overlap height, which guarantees each such face lies wholly inside one stripe; larger faces
+        come from a single whole-frame pass that starts at that size. Duplicates are merged with NMS.
+        Args:
+            gray_image (np.ndarray): Grayscale image.
+            min_size (int): Smallest face size to search for.
+        Returns:
+            list: (x, y, width, height) boxes in full-image coordinates.
+        """
+        height = gray_image.shape[0]
+        overlap = max(min_size, int(height * FACE_TILE_OVERLAP_RATIO))
+        step = -(-height // (FACE_TILES_PER_CORE * (os.cpu_count() or 1)))
+
+        def detect(top, bottom, min_face, max_face):
+            boxes = self._thread_cascade().detectMultiScale(
+                gray_image[top:bottom], scaleFactor=1.1, minNeighbors=5,
+                minSize=(min_face, min_face), maxSize=(max_face, max_face)
+            )
+            return [(int(x), int(y) + top, int(w), int(h)) for (x, y, w, h) in boxes]
+
+        futures = [
+            self._face_pool.submit(detect, top, min(height, top + step + overlap), min_size, overlap)
+            for top in range(0, height, step)
+        ]
+        futures.append(self._face_pool.submit(detect, 0, height, overlap, 0))  # maxSize 0 means unbounded
+        boxes = [box for future in futures for box in future.result()]
+        if not boxes:
+            return []
+        keep = cv2.dnn.NMSBoxes(boxes, [1.0] * len(boxes), 0.0, FACE_NMS_THRESHOLD)
+        return [boxes[i] for i in np.array(keep).flatten()]
+
     def detect_edges(self, image: np.ndarray, threshold1: int = 100, threshold2: int = 200) -> np.ndarray:
         """
         Applies edge detection on an image using the Canny method.
@@ -76,8 +474,9 @@ class VisionModule:
             np.ndarray: Image with detected edges.
         """
         try:
-            edges = cv2.Canny(image, threshold1, threshold2)
-            return edges
+            # UMat dispatches to OpenCL when available and to the optimized CPU path otherwise
+            edges = cv2.Canny(cv2.UMat(image), threshold1, threshold2)
+            return edges.get()
         except Exception as e:
             self.error_logger.log(f"Failed to detect edges: {e}")
             return None
@@ -90,17 +489,128 @@ class VisionModule:
         Returns:
             list: Detected objects with their labels and confidence.
         """
+        return self.recognize_objects_batch([image])[0]
+
+    def recognize_objects_batch(self, images: list) -> list:
+        """
+        Recognizes objects in several images, running every uncached image through the model in one batch.
+        Args:
+            images (list): Images to analyze.
+        Returns:
+            list: One list of detected objects per image, in input order.
+        """
         try:
-            preprocessed_image = self.preprocess_image_for_model(image)
-            if preprocessed_image is None:
-                return []
+            keys = [self._image_key("objects", image) for image in images]
+            results = [self._inference_cache.get(key) for key in keys]
+            missing = [index for index, cached in enumerate(results) if cached is None]
+            if not missing:
+                return results
+
+            # Uncached images are preprocessed straight into consecutive rows of one batch array;
+            # a row that fails is overwritten by the next image
+            batch = np.empty((len(missing),) + MODEL_INPUT_SHAPE[1:], dtype=np.float32)
+            pending = []
+            for index in missing:
+                results[index] = []
+                row = len(pending)
+                if self.preprocess_image_for_model(images[index], out=batch[row:row + 1]) is not None:
+                    pending.append(index)
+            if not pending:
+                return results
 
-            predictions = self.model.predict(preprocessed_image)
-            decoded_predictions = decode_predictions(predictions, top=5)[0]
-            return [{"label": label, "description": desc, "confidence": float(conf)} for (label, desc, conf) in decoded_predictions]
+            batch = batch[:len(pending)]
+            for index, objects in zip(pending, self._decode_predictions(self._predict(batch))):
+                self._inference_cache[keys[index]] = objects
+                results[index] = objects
+            return results
         except Exception as e:
             self.error_logger.log(f"Failed to recognize objects: {e}")
-            return []
+            return [[] for _ in images]
+
+    def recognize_objects_stream(self, frames):
+        """
+        Recognizes objects in a stream of frames (e.g. from a webcam), preprocessing upcoming frames
+        on a background thread while the current one is being inferred.
+        Args:
+            frames (iterable): Frames to analyze, consumed in order.
+        Yields:
+            list: Detected objects for each frame, in input order.
+        """
+        ready = queue.Queue(maxsize=PIPELINE_DEPTH)
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for frame in frames:
+                    if stop.is_set():
+                        return
+                    try:
+                        key = self._image_key("objects", frame)
+                        # Frames already in the cache skip preprocessing entirely
+                        preprocessed_image = _CACHED if key in self._inference_cache else self.preprocess_image_for_model(frame)
+                    except Exception as e:
+                        self.error_logger.log_error(f"Failed to recognize objects: {e}")
+                        key, preprocessed_image = None, _FAILED
+                    ready.put((frame, key, preprocessed_image))
+            except Exception as e:
+                ready.put(e)  # The frame source failed; re-raised in the consumer
+            finally:
+                ready.put(None)  # Always sent, so the consumer never waits on a dead producer
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        try:
+            while (item := ready.get()) is not None:
+                if isinstance(item, Exception):
+                    raise item
+                frame, key, preprocessed_image = item
+                if preprocessed_image is _FAILED:
+                    yield []
+                elif preprocessed_image is _CACHED:
+                    yield self.recognize_objects(frame)
+                else:
+                    try:
+                        objects = self._decode_predictions(self._predict(preprocessed_image))[0]
+                    except Exception as e:
+                        self.error_logger.log_error(f"Failed to recognize objects: {e}")
+                        objects = []
+                    else:
+                        self._inference_cache[key] = objects
+                    yield objects
+        finally:
+            # Unblock a producer stuck on a full queue if the caller stopped early
+            stop.set()
+            while producer.is_alive():
+                try:
+                    ready.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+    def _predict(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Runs a preprocessed batch through the classifier, via TensorRT or ONNX Runtime when available.
+        """
+        if self.runtime_model is not None:
+            # The engine is exported for a single image, so it is fed one frame at a time
+            return np.concatenate([self.runtime_model.infer(frame[np.newaxis])[0] for frame in batch])
+        return self.model.predict(batch, batch_size=len(batch))
+
+    @staticmethod
+    def _decode_predictions(predictions: np.ndarray) -> list:
+        """
+        Converts class scores into the top-k labelled objects for each row.
+        """
+        # Top-k per row: partition out the k best, then order just those by score
+        classes = _imagenet_classes()
+        top = np.argpartition(-predictions, TOP_K_PREDICTIONS, axis=1)[:, :TOP_K_PREDICTIONS]
+        scores = np.take_along_axis(predictions, top, axis=1)
+        order = np.argsort(-scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1).tolist()
+        scores = np.take_along_axis(scores, order, axis=1).astype(float).tolist()
+        return [
+            [{"label": classes[c][0], "description": classes[c][1], "confidence": score} for c, score in zip(row, row_scores)]
+            for row, row_scores in zip(top, scores)
+        ]
 
     def extract_features(self, image: np.ndarray) -> np.ndarray:
         """
@@ -111,18 +621,40 @@ class VisionModule:
             np.ndarray: Feature vector for the image.
         """
         try:
+            key = self._image_key("features", image)
+            cached = self._inference_cache.get(key)
+            if cached is not None:
+                return cached
+
             preprocessed_image = self.preprocess_image_for_model(image)
             if preprocessed_image is None:
                 return None
 
-            # Using the layer output just before the classifier
-            feature_extractor = Model(inputs=self.model.input, outputs=self.model.get_layer('avg_pool').output)
-            features = feature_extractor.predict(preprocessed_image)
+            if self.runtime_model is not None:
+                features = self.runtime_model.infer(preprocessed_image)[1]
+            else:
+                features = self._extract_features(preprocessed_image).numpy()
+            self._inference_cache[key] = features
             return features
         except Exception as e:
             self.error_logger.log(f"Failed to extract features: {e}")
             return None
 
+    def analyze(self, image: np.ndarray) -> dict:
+        """
+        Runs face detection, edge detection and object recognition on one image. The OpenCV steps run
+        on worker threads (OpenCV releases the GIL) while recognition runs on the model in this thread,
+        so latency is roughly the slower of the two rather than their sum.
+        Args:
+            image (np.ndarray): Image to analyze.
+        Returns:
+            dict: "faces", "edges" and "objects" results, as returned by the individual methods.
+        """
+        faces = self._analysis_pool.submit(self.detect_faces, image)
+        edges = self._analysis_pool.submit(self.detect_edges, image)
+        objects = self.recognize_objects(image)
+        return {"faces": faces.result(), "edges": edges.result(), "objects": objects}
+
     def classify_image(self, image: np.ndarray) -> str:
         """
         Classifies an image using the ResNet model to return the top prediction.
@@ -147,17 +679,11 @@ if __name__ == "__main__":
     # Load and preprocess an example image
     image = vision.load_image("example.jpg")
     if image is not None:
-        # Detect faces
-        faces = vision.detect_faces(image)
-        print("Detected faces:", faces)
-
-        # Edge detection
-        edges = vision.detect_edges(image)
-        print("Detected edges:", edges)
-
-        # Object recognition
-        objects = vision.recognize_objects(image)
-        print("Recognized objects:", objects)
+        # Face detection, edge detection and object recognition, run concurrently
+        analysis = vision.analyze(image)
+        print("Detected faces:", analysis["faces"])
+        print("Detected edges:", analysis["edges"])
+        print("Recognized objects:", analysis["objects"])
 
         # Feature extraction
         features = vision.extract_features(image)
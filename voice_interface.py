@@ -1,38 +1,94 @@
 import speech_recognition as sr
 import pyttsx3
+import functools
+import queue
 import threading
 import time
+import os
+import orjson
+try:
+    import vosk  # Optional: on-device streaming speech recognition, no network round-trip per utterance
+except ImportError:
+    vosk = None
 from error_logger import ErrorLogger  # Assuming we have an error logger module
 from task_scheduler import TaskScheduler  # For queued responses if needed
 
+VOSK_MODEL_PATH = "vosk-model-small-en-us-0.15"
+STT_SAMPLE_RATE = 16000
+STT_CHUNK_SIZE = 4000  # Samples per microphone read fed to the streaming recognizer
+LISTEN_TIMEOUT = 5  # Seconds to wait for speech to start before giving up
+
+
+# Speech engines are expensive to start (driver processes, voice lists, model files), so every
+# VoiceInterface in the process shares one of each, created on first use.
+@functools.lru_cache(maxsize=None)
+def _shared_recognizer():
+    return sr.Recognizer()
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_stt_model():
+    """Returns the Vosk model, or None when Vosk or its model directory isn't available."""
+    return vosk.Model(VOSK_MODEL_PATH) if vosk is not None and os.path.isdir(VOSK_MODEL_PATH) else None
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_tts():
+    """
+    Returns the queue of TTS requests. A single worker thread creates and owns the engine,
+    so speaking never blocks the caller and the engine is only ever touched from one thread.
+    """
+    responses = queue.Queue()
+    threading.Thread(target=_tts_worker, args=(responses,), daemon=True).start()
+    return responses
+
+
+def _tts_worker(responses):
+    """
+    Speaks queued (properties, text, logger) requests one at a time, in the order they were queued.
+    Each request carries its VoiceInterface's own settings, applied just before its text is spoken.
+    """
+    engine = None
+    while True:
+        properties, text, logger = responses.get()
+        try:
+            if engine is None:
+                engine = pyttsx3.init()
+                # Optionally, set a specific voice (e.g., female/male)
+                voices = engine.getProperty('voices')
+                engine.setProperty('voice', voices[1].id if len(voices) > 1 else voices[0].id)
+            for name, value in properties.items():
+                engine.setProperty(name, value)
+            engine.say(text)
+            engine.runAndWait()
+        except Exception as e:
+            logger.log_error(f"Text-to-speech error: {e}")
+        finally:
+            responses.task_done()
+
+
 class VoiceInterface:
     def __init__(self):
         # Initialize recognizer and TTS engine
-        self.recognizer = sr.Recognizer()
-        self.tts_engine = pyttsx3.init()
+        self.recognizer = _shared_recognizer()
+        # On-device recognizer used instead of the Google web API when Vosk and its model are available
+        self.stt_model = _shared_stt_model()
+        self.partial_transcript = ""  # Latest partial hypothesis while the user is still speaking
+        self._tts_q = _shared_tts()
         self.logger = ErrorLogger()
         self.task_scheduler = TaskScheduler()
         
-        # Customizable TTS settings
+        # Customizable TTS settings, sent with each utterance so instances sharing the engine keep their own
         self.voice_speed = 150  # Default speed for TTS
         self.voice_volume = 0.9  # Default volume level for TTS
-        self._configure_tts()
 
         # State management
         self.listening = False  # Indicates if Mia is listening for commands
-        self.response_queue = []  # Queue to store responses for sequential output
-
-    def _configure_tts(self):
-        """Configures TTS settings like speed, volume, and voice."""
-        self.tts_engine.setProperty('rate', self.voice_speed)
-        self.tts_engine.setProperty('volume', self.voice_volume)
-        
-        # Optionally, set a specific voice (e.g., female/male)
-        voices = self.tts_engine.getProperty('voices')
-        self.tts_engine.setProperty('voice', voices[1].id if len(voices) > 1 else voices[0].id)
 
     def listen(self) -> str:
         """Continuously listens for voice input and converts it to text."""
+        if self.stt_model is not None:
+            return self._listen_streaming()
         with sr.Microphone() as source:
             print("Mia is listening...")
             self.listening = True
@@ -53,39 +109,57 @@ class VoiceInterface:
             finally:
                 self.listening = False
 
+    def _listen_streaming(self) -> str:
+        """
+        Streams microphone audio through the on-device Vosk recognizer until an utterance is complete.
+        Partial hypotheses are exposed on partial_transcript as they arrive.
+        """
+        recognizer = vosk.KaldiRecognizer(self.stt_model, STT_SAMPLE_RATE)
+        self.partial_transcript = ""
+        with sr.Microphone(sample_rate=STT_SAMPLE_RATE, chunk_size=STT_CHUNK_SIZE) as source:
+            print("Mia is listening...")
+            self.listening = True
+            deadline = time.monotonic() + LISTEN_TIMEOUT
+            try:
+                while True:
+                    data = source.stream.read(source.CHUNK)
+                    if recognizer.AcceptWaveform(data):
+                        user_input = orjson.loads(recognizer.Result()).get("text", "")
+                        if user_input:
+                            print(f"User said: {user_input}")
+                            return user_input
+                        self.partial_transcript = ""
+                    else:
+                        self.partial_transcript = orjson.loads(recognizer.PartialResult()).get("partial", "")
+                    if not self.partial_transcript and time.monotonic() > deadline:
+                        self.logger.log_error("Voice timeout: No input detected.")
+                        return "timeout"
+            except OSError as e:
+                self.logger.log_error(f"Voice service error: {e}")
+                return "error"
+            finally:
+                self.listening = False
+
     def speak(self, text: str):
-        """Converts text to speech output and manages queued responses."""
+        """Queues text for speech output and returns without waiting for it to be spoken."""
         if not text:
             self.logger.log_error("Attempted to speak empty text.")
             return
-        
-        # If the engine is speaking, queue the new response
-        if self.tts_engine._inLoop:
-            self.response_queue.append(text)
-        else:
-            # Otherwise, speak immediately
-            print("Mia says:", text)
-            self.tts_engine.say(text)
-            self.tts_engine.runAndWait()
-            self._process_response_queue()
-
-    def _process_response_queue(self):
-        """Processes any responses queued while TTS engine was busy."""
-        while self.response_queue:
-            next_response = self.response_queue.pop(0)
-            self.tts_engine.say(next_response)
-            self.tts_engine.runAndWait()
+        print("Mia says:", text)
+        self._tts_q.put(({'rate': self.voice_speed, 'volume': self.voice_volume}, text, self.logger))
+
+    def wait_until_spoken(self):
+        """Blocks until every queued response has been spoken."""
+        self._tts_q.join()
 
     def set_voice_speed(self, speed: int):
         """Sets the TTS speed."""
         self.voice_speed = speed
-        self.tts_engine.setProperty('rate', speed)
 
     def set_voice_volume(self, volume: float):
         """Sets the TTS volume level."""
         if 0.0 <= volume <= 1.0:
             self.voice_volume = volume
-            self.tts_engine.setProperty('volume', volume)
         else:
             self.logger.log_error("Invalid volume level. Must be between 0.0 and 1.0.")
 
@@ -105,6 +179,7 @@ class VoiceInterface:
             # Break the conversation loop on specific keywords
             if user_input.lower() in ["stop", "goodbye", "exit"]:
                 self.speak("Goodbye! Talk to you soon.")
+                self.wait_until_spoken()
                 break
 
     def process_command(self, user_input: str) -> str: